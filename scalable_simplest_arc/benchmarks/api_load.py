@@ -0,0 +1,322 @@
+"""Throughput, latency and DB queries of the main API flows, in-process.
+
+Boots ``src.main:app`` with its lifespan behind httpx's ASGI transport, so no
+server, port or network is involved, against the configured database. Seeds
+``--users`` users and ``--tasks`` background tasks with ``benchmarks.seed``
+unless a seeded dataset is already there, and registers ``--clients`` users.
+Each client then logs in and runs a weighted mix of the scenarios below for
+``--duration`` seconds. Every scenario reports RPS, p50/p95/p99 and DB
+queries per request.
+
+Every request runs in a task of its own with a fresh context, as it would
+under a server; otherwise context the app sets, such as sticking to the
+primary after a write, would carry over into the client's next requests.
+Client and app share one event loop, so the numbers are for comparing runs
+with each other (``--output`` writes the report together with the commit),
+not for capacity planning. The row cache is off unless chosen; without a
+Redis server use ``ROW_CACHE_BACKEND=memory``::
+
+    python -m benchmarks.api_load --clients 50 --duration 30 --output a.json
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import random
+import subprocess
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+import httpx
+
+from benchmarks import seed
+from benchmarks.stats import summarize
+from src.db.db import engine, replica_router
+from src.db.profiler import RequestDBStats, instrument_engine, track_queries
+from src.main import app
+
+# relative weights; password updates are pbkdf2-bound, keep them rare
+DEFAULT_MIX = {
+    "login": 2,
+    "list_tasks": 40,
+    "get_task": 35,
+    "create_task": 20,
+    "update_password": 3,
+}
+PASSWORDS = ("bench_api_password_a", "bench_api_password_b")
+
+
+def isolated(request):
+    # the ASGI transport runs the app in the awaiting task, so each request
+    # gets a task and an empty context of its own, as under a server
+    return asyncio.create_task(request, context=contextvars.Context())
+
+
+async def timed(request) -> tuple[httpx.Response, float, RequestDBStats]:
+    with track_queries() as db:
+        started = time.perf_counter()
+        response = await request
+        return response, time.perf_counter() - started, db
+
+
+@dataclass
+class Client:
+    username: str
+    password: str = PASSWORDS[0]
+    headers: dict[str, str] = field(default_factory=dict)
+    task_ids: list[int] = field(default_factory=list)
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.queries: dict[str, list[int]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+
+    async def call(self, scenario: str, request) -> httpx.Response:
+        response, elapsed, db = await isolated(timed(request))
+        self.samples[scenario].append(elapsed)
+        self.queries[scenario].append(db.queries)
+        self.statuses[scenario][response.status_code] += 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        scenarios = {}
+        for scenario, samples in sorted(self.samples.items()):
+            queries = self.queries[scenario]
+            scenarios[scenario] = {
+                "rps": round(len(samples) / elapsed, 1),
+                **{key: round(value, 3) for key, value in summarize(samples).items()},
+                "db_queries_mean": round(sum(queries) / len(queries), 2),
+                "db_queries_max": max(queries),
+                "statuses": dict(self.statuses[scenario]),
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {
+            "requests": total,
+            "rps": round(total / elapsed, 1),
+            "scenarios": scenarios,
+        }
+
+
+async def login(http, client: Client, recorder: Recorder, rng) -> None:
+    response = await recorder.call(
+        "login",
+        http.post(
+            "/api/v1/auth/token",
+            data={"username": client.username, "password": client.password},
+        ),
+    )
+    if response.status_code == 200:
+        token = response.json()["access_token"]
+        client.headers = {"Authorization": f"Bearer {token}"}
+
+
+async def list_tasks(http, client: Client, recorder: Recorder, rng) -> None:
+    await recorder.call(
+        "list_tasks",
+        http.get(
+            "/api/v1/tasks",
+            params={"limit": 20, "offset": rng.randrange(0, 200, 20)},
+            headers=client.headers,
+        ),
+    )
+
+
+async def get_task(http, client: Client, recorder: Recorder, rng) -> None:
+    await recorder.call(
+        "get_task",
+        http.get(
+            f"/api/v1/tasks/{rng.choice(client.task_ids)}", headers=client.headers
+        ),
+    )
+
+
+async def create_task(http, client: Client, recorder: Recorder, rng) -> None:
+    response = await recorder.call(
+        "create_task",
+        http.post(
+            "/api/v1/tasks",
+            json={
+                "title": f"bench api task {rng.random()}",
+                "description": "bench",
+                "status": "new",
+                "assignee_id": None,
+            },
+            headers=client.headers,
+        ),
+    )
+    if response.status_code == 201:
+        client.task_ids.append(response.json()["id"])
+
+
+async def update_password(http, client: Client, recorder: Recorder, rng) -> None:
+    new_password = PASSWORDS[client.password == PASSWORDS[0]]
+    response = await recorder.call(
+        "update_password",
+        http.post(
+            "/api/v1/users/me/update-password",
+            json={
+                "old_password": client.password,
+                "new_password": new_password,
+                "re_new_password": new_password,
+            },
+            headers=client.headers,
+        ),
+    )
+    if response.status_code == 200:
+        client.password = new_password
+
+
+SCENARIOS = {
+    "login": login,
+    "list_tasks": list_tasks,
+    "get_task": get_task,
+    "create_task": create_task,
+    "update_password": update_password,
+}
+
+
+async def register(http, username: str) -> Client:
+    client = Client(username)
+    response = await isolated(
+        http.post(
+            "/api/v1/users",
+            json={
+                "username": username,
+                "password": client.password,
+                "first_name": "Bench",
+                "last_name": "Client",
+            },
+        )
+    )
+    response.raise_for_status()
+    await login(http, client, Recorder(), None)
+    # get_task needs something to read before the first create
+    response = await isolated(
+        http.post(
+            "/api/v1/tasks",
+            json={
+                "title": "bench api task",
+                "description": "bench",
+                "status": "new",
+                "assignee_id": None,
+            },
+            headers=client.headers,
+        )
+    )
+    response.raise_for_status()
+    client.task_ids.append(response.json()["id"])
+    return client
+
+
+async def client_loop(http, client, recorder, rng, mix, deadline) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        scenario = rng.choices(names, weights)[0]
+        await SCENARIOS[scenario](http, client, recorder, rng)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args, mix: dict[str, int]) -> dict:
+    if args.tasks:
+        seed_args = seed.build_parser().parse_args(
+            [
+                f"--users={args.users}",
+                f"--tasks={args.tasks}",
+                f"--seed={args.seed}",
+                "--keep-existing",
+            ]
+        )
+        await asyncio.to_thread(seed.seed, seed_args)
+    for instrumented in (
+        engine,
+        *(replica.engine for replica in replica_router.replicas),
+    ):
+        instrument_engine(instrumented)
+    run_id = uuid4().hex[:8]
+    recorder = Recorder()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as http:
+            clients = [
+                await register(http, f"bench_api_{run_id}_{i}")
+                for i in range(args.clients)
+            ]
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(
+                *(
+                    client_loop(
+                        http,
+                        client,
+                        recorder,
+                        random.Random(args.seed + i),
+                        mix,
+                        deadline,
+                    )
+                    for i, client in enumerate(clients)
+                )
+            )
+            elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return {
+        "commit": git_commit(),
+        "clients": args.clients,
+        "duration": args.duration,
+        "mix": mix,
+        "seconds": round(elapsed, 3),
+        **recorder.report(elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--mix",
+        nargs="+",
+        metavar="SCENARIO=WEIGHT",
+        default=[],
+        help=f"override weights of {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    mix = dict(DEFAULT_MIX)
+    for item in args.mix:
+        scenario, _, weight = item.partition("=")
+        if scenario not in SCENARIOS:
+            parser.error(f"unknown scenario {scenario!r}")
+        mix[scenario] = int(weight)
+    mix = {scenario: weight for scenario, weight in mix.items() if weight > 0}
+
+    report = json.dumps(asyncio.run(run(args, mix)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
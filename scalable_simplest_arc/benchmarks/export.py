@@ -0,0 +1,68 @@
+"""Export throughput and memory at growing table sizes.
+
+Seeds tasks up to each ``--sizes`` entry (reusing the task_indexes seeder),
+then drains ``TaskService.stream_all`` through the NDJSON or CSV encoder
+without sending anything, and reports rows/s, MB/s and the peak of Python
+allocations. The peak should stay flat as the table grows::
+
+    python -m benchmarks.export --sizes 1000 100000 1000000 --format csv
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from benchmarks.task_indexes import seed
+from src.core.export import ExportFormat, encode_rows
+from src.core.services.tasks.task import TaskService
+from src.db.db import async_session_maker, engine
+
+
+async def export_once(format_: ExportFormat) -> dict:
+    async with async_session_maker() as session:
+        service = TaskService(session)
+        names = [column.key for column in service.get_export_columns()]
+        rows = size = 0
+        tracemalloc.start()
+        started = time.perf_counter()
+        async for chunk in encode_rows(names, service.stream_all(), format_):
+            size += len(chunk)
+            rows += chunk.count(b"\n")
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    if format_ is ExportFormat.CSV:
+        rows -= 1
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed),
+        "mb_per_second": round(size / elapsed / 1e6, 1),
+        "peak_traced_mb": round(peak / 1e6, 1),
+    }
+
+
+async def run(sizes: list[int], users: int, format_: ExportFormat) -> dict:
+    report = {"format": format_.value, "results": []}
+    for tasks in sorted(sizes):
+        await seed(users, tasks)
+        report["results"].append(await export_once(format_))
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument(
+        "--format", type=ExportFormat, default=ExportFormat.NDJSON, dest="format_"
+    )
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.sizes, args.users, args.format_)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
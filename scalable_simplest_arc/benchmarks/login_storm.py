@@ -0,0 +1,86 @@
+"""Latency of an unrelated route before and during a login storm.
+
+Runs against an already started server. A probe keeps hitting
+``/api/health`` at a fixed rate, first alone and then while ``--logins``
+concurrent clients hammer ``/api/v1/auth/token``. With hashing off the event
+loop the probe's p99 should stay flat, and logins beyond the hasher's
+pending cap come back as 503::
+
+    python -m benchmarks.login_storm --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.stats import summarize
+
+
+async def probe(client: httpx.AsyncClient, duration: float, interval: float):
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/api/health")
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def login_loop(client, credentials, deadline, statuses, samples):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.post("/api/v1/auth/token", data=credentials)
+        samples.append(time.perf_counter() - started)
+        statuses[response.status_code] += 1
+
+
+async def run(args) -> dict:
+    credentials = {"username": args.username, "password": args.password}
+    limits = httpx.Limits(max_connections=args.logins + 1)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as client:
+        # make sure the login user exists; a 400 means it already does
+        await client.post(
+            "/api/v1/users",
+            json={**credentials, "first_name": "Bench", "last_name": "User"},
+        )
+        idle = await probe(client, args.duration, args.interval)
+
+        statuses, login_samples = Counter(), []
+        deadline = time.perf_counter() + args.duration
+        storm = [
+            asyncio.create_task(
+                login_loop(client, credentials, deadline, statuses, login_samples)
+            )
+            for _ in range(args.logins)
+        ]
+        busy = await probe(client, args.duration, args.interval)
+        await asyncio.gather(*storm)
+
+    return {
+        "health_idle": summarize(idle),
+        "health_during_storm": summarize(busy),
+        "login": {**summarize(login_samples), "statuses": dict(statuses)},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="bench_login")
+    parser.add_argument("--password", default="bench_login_password")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Seed a realistic, reproducible dataset of users and tasks.
+
+Generates ``--users`` users and ``--tasks`` tasks with production-like skew:
+
+- owners and assignees follow a Zipf distribution, so a few users own most
+  tasks;
+- creation times spread over ``--years`` before ``--until``, denser towards
+  the end and rising with the insert order, as they would in production;
+- old tasks are mostly done, recent ones mostly new or in progress;
+- a fifth of the tasks are unassigned and a tenth are inactive.
+
+Rows are generated in fixed-size chunks, each from its own RNG derived from
+``--seed``, so the same seed and chunk size give the same data whatever
+``--jobs`` is. On Postgres every worker process COPYs its chunks over its
+own connection. On SQLite the workers only generate and a single writer
+loads, since the file takes one writer at a time::
+
+    python -m benchmarks.seed --users 100000 --tasks 10000000 --jobs 8 --reset
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from src.core.config import settings
+from src.utils.passwords import hash_password
+
+SEED_PASSWORD = "seed_password"
+USERNAME_PREFIX = "seed_user_"
+USER_COLUMNS = (
+    "username",
+    "password",
+    "first_name",
+    "last_name",
+    "created_at",
+    "updated_at",
+    "is_active",
+)
+TASK_COLUMNS = (
+    "title",
+    "description",
+    "status",
+    "created_by_id",
+    "assignee_id",
+    "created_at",
+    "updated_at",
+    "is_active",
+)
+FIRST_NAMES = ("Alex", "Sam", "Maria", "Wei", "Aisha", "Ivan", "Lea", "Omar")
+LAST_NAMES = ("Smith", "Garcia", "Chen", "Khan", "Novak", "Ito", "Okafor", "Rossi")
+DESCRIPTIONS = (
+    "Follow up with the customer",
+    "Fix the failing nightly job",
+    "Review the pull request",
+    "Prepare the quarterly report",
+    "Update the onboarding docs",
+)
+# anything older than this is mostly done
+RECENT = timedelta(days=90)
+
+# set in every worker process by _init_worker
+_worker: dict = {}
+
+
+def zipf_cum_weights(n: int, exponent: float) -> list[float]:
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, n + 1)))
+
+
+def chunk_rng(seed: int, kind: str, start: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{start}")
+
+
+def user_rows(start: int, stop: int, password: str, args) -> list[tuple]:
+    rng = chunk_rng(args.seed, "users", start)
+    span = args.years * 365 * 86400
+    rows = []
+    for i in range(start, stop):
+        created_at = args.until - timedelta(seconds=rng.random() * span)
+        rows.append(
+            (
+                f"{USERNAME_PREFIX}{i:08d}",
+                password,
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                created_at,
+                created_at,
+                rng.random() >= 0.02,
+            )
+        )
+    return rows
+
+
+def task_rows(bounds: tuple[int, int]) -> list[tuple]:
+    start, stop = bounds
+    args, user_ids = _worker["args"], _worker["user_ids"]
+    rng = chunk_rng(args.seed, "tasks", start)
+    count = stop - start
+    owners = rng.choices(user_ids, cum_weights=_worker["owner_weights"], k=count)
+    assignees = rng.choices(user_ids, cum_weights=_worker["assignee_weights"], k=count)
+    span = args.years * 365 * 86400
+    rows = []
+    for i in range(count):
+        # creation follows the row's position, as it would with a sequence,
+        # and the square root makes the later years denser
+        position = (start + i + rng.random()) / args.tasks
+        age = timedelta(seconds=span * (1 - math.sqrt(position)))
+        created_at = args.until - age
+        roll = rng.random()
+        if age > RECENT:
+            status = "DONE" if roll < 0.85 else "NEW" if roll < 0.95 else "IN_PROGRESS"
+        else:
+            status = "NEW" if roll < 0.4 else "IN_PROGRESS" if roll < 0.75 else "DONE"
+        updated_at = min(
+            created_at + timedelta(seconds=rng.random() * 30 * 86400), args.until
+        )
+        rows.append(
+            (
+                f"Task {start + i}",
+                rng.choice(DESCRIPTIONS),
+                status,
+                owners[i],
+                None if rng.random() < 0.2 else assignees[i],
+                created_at,
+                updated_at,
+                rng.random() >= 0.1,
+            )
+        )
+    return rows
+
+
+def _init_worker(args, user_ids: list[int]) -> None:
+    _worker["args"] = args
+    _worker["user_ids"] = user_ids
+    _worker["owner_weights"] = zipf_cum_weights(len(user_ids), args.owner_skew)
+    _worker["assignee_weights"] = zipf_cum_weights(len(user_ids), args.owner_skew / 2)
+
+
+def _copy_tasks(bounds: tuple[int, int]) -> int:
+    async def copy() -> int:
+        connection = await asyncpg.connect(_worker["args"].dsn)
+        try:
+            records = task_rows(bounds)
+            await connection.copy_records_to_table(
+                "tasks", records=records, columns=TASK_COLUMNS
+            )
+        finally:
+            await connection.close()
+        return len(records)
+
+    return asyncio.run(copy())
+
+
+def chunks(total: int, size: int) -> list[tuple[int, int]]:
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+async def seed_postgres(args) -> None:
+    connection = await asyncpg.connect(args.dsn)
+    try:
+        if args.reset:
+            # RESTART IDENTITY makes user ids reproducible too
+            await connection.execute("TRUNCATE tasks, users RESTART IDENTITY CASCADE")
+        elif await connection.fetchval(
+            "SELECT count(*) FROM users WHERE substr(username, 1, $1) = $2",
+            len(USERNAME_PREFIX),
+            USERNAME_PREFIX,
+        ):
+            if args.keep_existing:
+                return
+            raise SystemExit("seed users already exist, pass --reset")
+
+        password = hash_password(SEED_PASSWORD)
+        for start, stop in chunks(args.users, args.chunk_size):
+            await connection.copy_records_to_table(
+                "users",
+                records=user_rows(start, stop, password, args),
+                columns=USER_COLUMNS,
+            )
+        user_ids = [
+            row["id"]
+            for row in await connection.fetch(
+                "SELECT id FROM users WHERE substr(username, 1, $1) = $2 "
+                "ORDER BY username",
+                len(USERNAME_PREFIX),
+                USERNAME_PREFIX,
+            )
+        ]
+
+        with ProcessPoolExecutor(
+            args.jobs, initializer=_init_worker, initargs=(args, user_ids)
+        ) as pool:
+            for _ in pool.map(_copy_tasks, chunks(args.tasks, args.chunk_size)):
+                pass
+
+        await connection.execute("ANALYZE users")
+        await connection.execute("ANALYZE tasks")
+    finally:
+        await connection.close()
+
+
+def _sqlite_value(value):
+    # the format SQLAlchemy's SQLite DateTime reads back
+    if isinstance(value, datetime):
+        return value.isoformat(" ", "microseconds")
+    return value
+
+
+def seed_sqlite(args) -> None:
+    connection = sqlite3.connect(settings.sqlite_path, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        # up to 1 GiB of page cache: maintaining the task indexes dominates
+        connection.execute("PRAGMA cache_size = -1048576")
+        connection.execute("BEGIN IMMEDIATE")
+        if args.reset:
+            connection.execute("DELETE FROM tasks")
+            connection.execute("DELETE FROM users")
+        elif connection.execute(
+            "SELECT count(*) FROM users WHERE substr(username, 1, ?) = ?",
+            (len(USERNAME_PREFIX), USERNAME_PREFIX),
+        ).fetchone()[0]:
+            if args.keep_existing:
+                return
+            raise SystemExit("seed users already exist, pass --reset")
+
+        def insert(table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:
+            connection.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                (tuple(_sqlite_value(value) for value in row) for row in rows),
+            )
+
+        password = hash_password(SEED_PASSWORD)
+        for start, stop in chunks(args.users, args.chunk_size):
+            insert("users", USER_COLUMNS, user_rows(start, stop, password, args))
+        user_ids = [
+            row[0]
+            for row in connection.execute(
+                "SELECT id FROM users WHERE substr(username, 1, ?) = ? "
+                "ORDER BY username",
+                (len(USERNAME_PREFIX), USERNAME_PREFIX),
+            )
+        ]
+
+        with ProcessPoolExecutor(
+            args.jobs, initializer=_init_worker, initargs=(args, user_ids)
+        ) as pool:
+            for rows in pool.map(task_rows, chunks(args.tasks, args.chunk_size)):
+                insert("tasks", TASK_COLUMNS, rows)
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument(
+        "--until", type=datetime.fromisoformat, default=datetime(2026, 1, 1)
+    )
+    # Zipf exponent for task owners; assignees use half of it
+    parser.add_argument("--owner-skew", type=float, default=1.1)
+    reuse = parser.add_mutually_exclusive_group()
+    reuse.add_argument(
+        "--reset", action="store_true", help="delete all users and tasks first"
+    )
+    reuse.add_argument(
+        "--keep-existing",
+        action="store_true",
+        help="do nothing if seed users already exist",
+    )
+    return parser
+
+
+def seed(args: argparse.Namespace) -> None:
+    if settings.database_backend == "sqlite":
+        seed_sqlite(args)
+        return
+    args.dsn = (
+        make_url(settings.database_uri)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+    asyncio.run(seed_postgres(args))
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.users < 1 and args.tasks:
+        parser.error("tasks need at least one user")
+
+    started = time.perf_counter()
+    seed(args)
+    elapsed = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                "backend": settings.database_backend,
+                "users": args.users,
+                "tasks": args.tasks,
+                "seconds": round(elapsed, 1),
+                "rows_per_second": round((args.users + args.tasks) / elapsed),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""CPU cost of serializing a page of ORM rows, default path vs fast path.
+
+The default path is what FastAPI does with ``response_model``: validate the
+rows, turn them into JSON-compatible python and ``json.dumps`` the result.
+The fast path is ``src.core.responses.model_response``. No database is
+needed; the rows are transient ``Task`` instances::
+
+    python -m benchmarks.serialization --rows 1000 --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from src.core.config import settings
+from src.core.responses import model_response
+from src.core.schemas.tasks import TaskListSchema
+from src.db.models import Task, TaskStatus
+
+
+def make_rows(count: int) -> list[Task]:
+    now = datetime.utcnow()
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="Seeded row for the serialization benchmark",
+            status=TaskStatus.IN_PROGRESS,
+            assignee_id=i % 50 or None,
+            created_by_id=1,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def default_path(field, rows) -> bytes:
+    content = await serialize_response(
+        field=field, response_content=rows, is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+def fast_path(rows) -> bytes:
+    return model_response(list[TaskListSchema], rows).body
+
+
+async def run(rows_count: int, repeat: int) -> dict:
+    rows = make_rows(rows_count)
+    field = create_response_field(name="response", type_=list[TaskListSchema])
+    settings.fast_responses = True
+    assert json.loads(await default_path(field, rows)) == json.loads(fast_path(rows))
+
+    started = time.process_time()
+    for _ in range(repeat):
+        await default_path(field, rows)
+    default_cpu = (time.process_time() - started) / repeat
+
+    started = time.process_time()
+    for _ in range(repeat):
+        fast_path(rows)
+    fast_cpu = (time.process_time() - started) / repeat
+
+    return {
+        "rows": rows_count,
+        "repeat": repeat,
+        "default_ms_per_request": default_cpu * 1000,
+        "fast_ms_per_request": fast_cpu * 1000,
+        "saved_ms_per_request": (default_cpu - fast_cpu) * 1000,
+        "speedup": default_cpu / fast_cpu if fast_cpu else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.rows, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
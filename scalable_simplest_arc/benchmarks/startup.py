@@ -0,0 +1,153 @@
+"""Worker cold start: import cost per module and time to first request.
+
+Every run is a fresh interpreter, as a new gunicorn worker or a ``--reload``
+cycle would be. The report has:
+
+- ``imports``: ``python -X importtime`` for ``src.main``, with the costliest
+  modules by self time and the totals per top-level package;
+- ``phases``: medians over ``--runs`` of the process start, importing the
+  app, running its lifespan startup, the first ``/api/health`` and the first
+  ``/openapi.json`` (built in-process unless OPENAPI_FILE points at a
+  precomputed document).
+
+No database or Redis connection is made::
+
+    python -m benchmarks.startup --runs 5 --top 25
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)$")
+
+
+def import_report(top: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules, packages = [], defaultdict(float)
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, name = match.groups()
+        modules.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+        packages[name.split(".")[0]] += int(self_us) / 1000
+    total = next(
+        (cumulative for name, _, cumulative in modules if name == "src.main"), 0
+    )
+    costliest = sorted(modules, key=lambda module: -module[1])[:top]
+    return {
+        "total_ms": round(total, 1),
+        "modules": [
+            {
+                "module": name,
+                "self_ms": round(self_ms, 2),
+                "cumulative_ms": round(cumulative_ms, 2),
+            }
+            for name, self_ms, cumulative_ms in costliest
+        ],
+        "packages": {
+            package: round(self_ms, 1)
+            for package, self_ms in sorted(packages.items(), key=lambda p: -p[1])[:top]
+        },
+    }
+
+
+async def _get(app, path: str) -> None:
+    # a bare ASGI call, so no HTTP client is imported into the measurement
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"startup")],
+        "client": ("127.0.0.1", 0),
+        "server": ("startup", 80),
+    }
+    await app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+
+
+async def _serve(app, marks: dict) -> None:
+    async with app.router.lifespan_context(app):
+        marks["startup"] = time.perf_counter()
+        await _get(app, "/api/health")
+        marks["first_request"] = time.perf_counter()
+        await _get(app, "/openapi.json")
+        marks["openapi"] = time.perf_counter()
+
+
+def child() -> None:
+    marks = {"start": time.perf_counter()}
+    from src.main import app
+
+    marks["import"] = time.perf_counter()
+    asyncio.run(_serve(app, marks))
+    print(json.dumps(marks))
+
+
+def phase_report(runs: int) -> dict:
+    phases = defaultdict(list)
+    for _ in range(runs):
+        launched = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # perf_counter is system-wide on Linux, so the child's marks line up
+        # with the parent's
+        marks = json.loads(result.stdout.strip().splitlines()[-1])
+        previous = launched
+        for phase in ("start", "import", "startup", "first_request", "openapi"):
+            phases[phase].append((marks[phase] - previous) * 1000)
+            previous = marks[phase]
+        phases["time_to_first_request"].append(
+            (marks["first_request"] - launched) * 1000
+        )
+    return {phase: round(statistics.median(ms), 1) for phase, ms in phases.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+    report = {"imports": import_report(args.top), "phases": phase_report(args.runs)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""EXPLAIN the hot task filters with and without the e3f19b7d6a52 indexes.
+
+Seeds ``--users`` bench users and ``--tasks`` tasks (default one million) into
+the configured database, then prints ``EXPLAIN (ANALYZE, BUFFERS)`` for the
+"my tasks", "assigned to me by status" and "by status" queries.
+The "before" plans are taken inside a transaction that drops the new indexes
+and is rolled back, so the database is left as migrated::
+
+    python -m benchmarks.task_indexes --tasks 1000000
+"""
+
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import func, select, text
+
+from src.db.db import async_session_maker, engine
+from src.db.models.tasks import Task, TaskStatus
+from src.db.models.users import User
+
+NEW_INDEXES = (
+    "ix_tasks_created_by_id_created_at",
+    "ix_tasks_assignee_id_status_created_at",
+    "ix_tasks_status_created_at",
+)
+
+SEED_USERS = text(
+    "INSERT INTO users "
+    "(username, password, first_name, last_name, created_at, updated_at, is_active) "
+    "SELECT 'bench_user_' || g, 'x', 'Bench', 'User', now(), now(), true "
+    "FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g"
+)
+
+# a tenth of the tasks are inactive, a fifth unassigned, statuses round-robin
+SEED_TASKS = text(
+    "INSERT INTO tasks "
+    "(title, description, status, created_by_id, assignee_id, "
+    "created_at, updated_at, is_active) "
+    "SELECT 'bench task ' || g, 'bench', "
+    "CAST((ARRAY['NEW', 'IN_PROGRESS', 'DONE'])[1 + g % 3] AS taskstatus), "
+    "u.ids[1 + g % cardinality(u.ids)], "
+    "CASE WHEN g % 5 = 0 THEN NULL "
+    "ELSE u.ids[1 + (g * 7) % cardinality(u.ids)] END, "
+    "now() - make_interval(secs => g), now(), g % 10 <> 0 "
+    "FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g, "
+    "(SELECT array_agg(id) AS ids FROM users "
+    "WHERE username LIKE 'bench\\_user\\_%') AS u"
+)
+
+
+def queries(user_id: int) -> dict:
+    return {
+        "created_by": select(Task)
+        .where(Task.created_by_id == user_id)
+        .order_by(Task.created_at.desc())
+        .limit(20),
+        "assignee_status": select(Task)
+        .where(Task.assignee_id == user_id, Task.status == TaskStatus.IN_PROGRESS)
+        .order_by(Task.created_at.desc())
+        .limit(20),
+        "status": select(Task)
+        .where(Task.status == TaskStatus.NEW)
+        .order_by(Task.created_at.desc())
+        .limit(20),
+    }
+
+
+async def seed(users: int, tasks: int) -> int:
+    async with async_session_maker() as session:
+        existing = await session.scalar(
+            select(func.count())
+            .select_from(User)
+            .where(User.username.like("bench\\_user\\_%"))
+        )
+        if existing < users:
+            await session.execute(SEED_USERS, {"start": existing + 1, "stop": users})
+        existing = await session.scalar(
+            select(func.count())
+            .select_from(Task)
+            .where(Task.title.like("bench task %"))
+        )
+        if existing < tasks:
+            await session.execute(SEED_TASKS, {"start": existing + 1, "stop": tasks})
+        await session.commit()
+        await session.execute(text("ANALYZE users"))
+        await session.execute(text("ANALYZE tasks"))
+        await session.commit()
+        return await session.scalar(
+            select(User.id).where(User.username == "bench_user_1")
+        )
+
+
+async def explain(session, query) -> list[str]:
+    sql = query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    plan = await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+    return [row[0] for row in plan]
+
+
+async def run(users: int, tasks: int) -> dict:
+    user_id = await seed(users, tasks)
+    report = {"users": users, "tasks": tasks, "before": {}, "after": {}}
+    async with async_session_maker() as session:
+        for label, query in queries(user_id).items():
+            report["after"][label] = await explain(session, query)
+        await session.rollback()
+
+        for name in NEW_INDEXES:
+            await session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for label, query in queries(user_id).items():
+            report["before"][label] = await explain(session, query)
+        await session.rollback()
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.users, args.tasks)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
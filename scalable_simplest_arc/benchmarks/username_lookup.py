@@ -0,0 +1,83 @@
+"""Username lookup latency before and after the lower(username) index.
+
+Seeds ``bench_user_<n>`` rows into the configured database until there are
+``--users`` of them, then times the old ``ILIKE '%name%'`` lookup against the
+exact ``lower(username) = lower(:name)`` lookup used by login and
+``get_current_user``::
+
+    python -m benchmarks.username_lookup --users 1000000 --lookups 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from sqlalchemy import func, select, text
+
+from benchmarks.stats import summarize
+from src.db.db import async_session_maker, engine
+from src.db.models.users import User
+
+SEED_USERS = text(
+    "INSERT INTO users "
+    "(username, password, first_name, last_name, created_at, updated_at, is_active) "
+    "SELECT 'bench_user_' || g, 'x', 'Bench', 'User', now(), now(), true "
+    "FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g"
+)
+
+LOOKUPS = {
+    "icontains": lambda name: select(User).where(User.username.icontains(name)),
+    "lower_eq": lambda name: select(User).where(
+        func.lower(User.username) == name.lower()
+    ),
+}
+
+
+async def seed(users: int) -> None:
+    async with async_session_maker() as session:
+        existing = await session.scalar(
+            select(func.count())
+            .select_from(User)
+            .where(User.username.like("bench\\_user\\_%"))
+        )
+        if existing < users:
+            await session.execute(SEED_USERS, {"start": existing + 1, "stop": users})
+            await session.execute(text("ANALYZE users"))
+            await session.commit()
+
+
+async def run(users: int, lookups: int) -> dict:
+    await seed(users)
+    names = [f"BENCH_USER_{random.randint(1, users)}" for _ in range(lookups)]
+    report = {"users": users, "lookups": lookups, "results": {}}
+    async with async_session_maker() as session:
+        for label, build in LOOKUPS.items():
+            sql = build(names[0]).compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = await session.execute(text(f"EXPLAIN {sql}"))
+            samples = []
+            for name in names:
+                started = time.perf_counter()
+                (await session.execute(build(name))).scalars().first()
+                samples.append(time.perf_counter() - started)
+            report["results"][label] = {
+                **summarize(samples),
+                "plan": [row[0] for row in plan],
+            }
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.users, args.lookups)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
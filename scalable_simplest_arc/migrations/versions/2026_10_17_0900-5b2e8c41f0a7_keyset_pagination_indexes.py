@@ -0,0 +1,49 @@
+"""keyset pagination indexes
+
+Revision ID: 5b2e8c41f0a7
+Revises: d74d696c3768
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e8c41f0a7"
+down_revision: Union[str, None] = "d74d696c3768"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_users_created_at_id", "users"),
+    ("ix_tasks_created_at_id", "tasks"),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; a failed build leaves an
+    # INVALID index behind which has to be dropped before re-running
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["created_at", "id"],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
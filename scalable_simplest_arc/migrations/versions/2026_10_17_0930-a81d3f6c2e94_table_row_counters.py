@@ -0,0 +1,110 @@
+"""table row counters
+
+Revision ID: a81d3f6c2e94
+Revises: 5b2e8c41f0a7
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a81d3f6c2e94"
+down_revision: Union[str, None] = "5b2e8c41f0a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTED_TABLES = ("users", "tasks")
+
+# statement-level triggers with transition tables, so a multi-row INSERT or
+# DELETE touches the counter row once instead of once per row
+MAINTAIN_ROW_COUNT = """
+CREATE FUNCTION maintain_table_row_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE table_row_counts
+        SET row_count = row_count + (SELECT count(*) FROM new_rows)
+        WHERE table_name = TG_TABLE_NAME;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE table_row_counts
+        SET row_count = row_count - (SELECT count(*) FROM old_rows)
+        WHERE table_name = TG_TABLE_NAME;
+    ELSE
+        UPDATE table_row_counts SET row_count = 0 WHERE table_name = TG_TABLE_NAME;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+
+# SQLite has neither transition tables nor TRUNCATE: row-level triggers
+SQLITE_TRIGGERS = {
+    "insert": "AFTER INSERT ON {table} BEGIN UPDATE table_row_counts "
+    "SET row_count = row_count + 1 WHERE table_name = '{table}'; END",
+    "delete": "AFTER DELETE ON {table} BEGIN UPDATE table_row_counts "
+    "SET row_count = row_count - 1 WHERE table_name = '{table}'; END",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_row_counts",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("row_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    if op.get_bind().dialect.name == "sqlite":
+        for table in COUNTED_TABLES:
+            op.execute(
+                f"INSERT INTO table_row_counts (table_name, row_count) "
+                f"SELECT '{table}', count(*) FROM {table}"
+            )
+            for event, trigger in SQLITE_TRIGGERS.items():
+                op.execute(
+                    f"CREATE TRIGGER {table}_row_count_{event} "
+                    + trigger.format(table=table)
+                )
+        return
+
+    op.execute(MAINTAIN_ROW_COUNT)
+    for table in COUNTED_TABLES:
+        # block writers while the initial count is taken so no row is missed
+        op.execute(f"LOCK TABLE {table} IN SHARE MODE")
+        op.execute(
+            f"INSERT INTO table_row_counts (table_name, row_count) "
+            f"SELECT '{table}', count(*) FROM {table}"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_row_count_insert AFTER INSERT ON {table} "
+            f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION maintain_table_row_count()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_row_count_delete AFTER DELETE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION maintain_table_row_count()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_row_count_truncate AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION maintain_table_row_count()"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for table in COUNTED_TABLES:
+            for event in SQLITE_TRIGGERS:
+                op.execute(f"DROP TRIGGER {table}_row_count_{event}")
+        op.drop_table("table_row_counts")
+        return
+
+    for table in COUNTED_TABLES:
+        for event in ("insert", "delete", "truncate"):
+            op.execute(f"DROP TRIGGER {table}_row_count_{event} ON {table}")
+    op.execute("DROP FUNCTION maintain_table_row_count()")
+    op.drop_table("table_row_counts")
@@ -0,0 +1,40 @@
+"""case-insensitive username index
+
+Revision ID: c4e7a90b1d25
+Revises: a81d3f6c2e94
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e7a90b1d25"
+down_revision: Union[str, None] = "a81d3f6c2e94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # built online; if usernames already collide case-insensitively the build
+    # fails and leaves an INVALID index that has to be dropped before retrying
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_username_lower",
+            "users",
+            [sa.text("lower(username)")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_username_lower",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,49 @@
+"""task filter indexes
+
+Revision ID: e3f19b7d6a52
+Revises: c4e7a90b1d25
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f19b7d6a52"
+down_revision: Union[str, None] = "c4e7a90b1d25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_tasks_created_by_id_created_at", ["created_by_id", "created_at"]),
+    ("ix_tasks_assignee_id_status_created_at", ["assignee_id", "status", "created_at"]),
+    ("ix_tasks_status_created_at", ["status", "created_at"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; a failed build leaves an
+    # INVALID index behind which has to be dropped before re-running
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="tasks",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
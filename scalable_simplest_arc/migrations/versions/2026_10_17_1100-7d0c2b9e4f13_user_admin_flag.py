@@ -0,0 +1,31 @@
+"""user admin flag
+
+Revision ID: 7d0c2b9e4f13
+Revises: e3f19b7d6a52
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d0c2b9e4f13"
+down_revision: Union[str, None] = "e3f19b7d6a52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a constant default, so Postgres adds the column without rewriting the
+    # table; grant with UPDATE users SET is_admin = true WHERE ...
+    op.add_column(
+        "users",
+        sa.Column("is_admin", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "is_admin")
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from src.api.v1.admin import admin_cache_router, admin_router
 from src.api.v1.tasks import task_router
 from src.api.v1.users import auth_router, user_router
 
@@ -8,3 +9,5 @@ v1_router = APIRouter(prefix="/v1")
 v1_router.include_router(user_router)
 v1_router.include_router(auth_router)
 v1_router.include_router(task_router)
+v1_router.include_router(admin_router)
+v1_router.include_router(admin_cache_router)
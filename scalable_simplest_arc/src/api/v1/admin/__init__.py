@@ -0,0 +1,2 @@
+from src.api.v1.admin.cache import router as admin_cache_router
+from src.api.v1.admin.pool import router as admin_router
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, status
+
+from src.core.schemas.admin import RowCacheStatsSchema, SingleFlightStatsSchema
+from src.core.services.cache import row_cache
+from src.core.services.singleflight import single_flight
+from src.core.services.users import get_current_admin_user
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+# counters of the worker process that happened to serve the request, per table
+@router.get(
+    "/row-cache",
+    response_model=dict[str, RowCacheStatsSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def get_row_cache_stats(
+    current_user=Depends(get_current_admin_user),
+):
+    return row_cache.snapshot()
+
+
+@router.get(
+    "/single-flight",
+    response_model=SingleFlightStatsSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_single_flight_stats(
+    current_user=Depends(get_current_admin_user),
+):
+    return single_flight.snapshot()
@@ -0,0 +1,23 @@
+import os
+
+from fastapi import APIRouter, Depends, status
+
+from src.core.schemas.admin import PoolsStatusSchema
+from src.core.services.users import get_current_admin_user
+from src.db.db import named_engines
+from src.db.pool import pool_status
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+# reports the pools of the worker process that happened to serve the request
+@router.get(
+    "/db-pool", response_model=PoolsStatusSchema, status_code=status.HTTP_200_OK
+)
+async def get_db_pool_status(
+    current_user=Depends(get_current_admin_user),
+):
+    return {
+        "pid": os.getpid(),
+        "pools": [pool_status(name, engine.pool) for name, engine in named_engines()],
+    }
@@ -1,26 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Sequence
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, ValidationError
+
+from src.core.conditional import (
+    is_conditional,
+    not_modified,
+    page_validators,
+    row_validators,
+    set_validators,
+)
+from src.core.export import ExportFormat, export_response
+from src.core.imports import RecordError, batched, iter_records
+from src.core.paginate import MAX_PAGE_SIZE, get_next_cursor
+from src.core.responses import model_response
+from src.core.schemas.bulk import BulkItemErrorSchema
 from src.core.schemas.tasks import (
+    TaskBulkCreateResultSchema,
+    TaskBulkResultSchema,
+    TaskBulkUpdateSchema,
     TaskCreateSchema,
     TaskDetailSchema,
+    TaskImportResultSchema,
     TaskListSchema,
     TaskUpdateSchema,
 )
 from src.core.services.tasks import get_task_service
 from src.core.services.users.auth import get_current_user
+from src.db.models.tasks import Task
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
+def _validate_bulk_items(
+    items: Sequence[dict[str, Any]], schema: type[BaseModel]
+) -> tuple[list[dict[str, Any]], list[int], list[BulkItemErrorSchema]]:
+    # validate item by item so one bad row is reported instead of failing
+    # the whole request with a 422
+    rows, positions, errors = [], [], []
+    for index, item in enumerate(items):
+        try:
+            rows.append(schema.model_validate(item).dict())
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in e.errors()
+            )
+            errors.append(BulkItemErrorSchema(index=index, detail=detail))
+            continue
+        positions.append(index)
+    return rows, positions, errors
+
+
 @router.get("", response_model=list[TaskListSchema], status_code=status.HTTP_200_OK)
 async def get_tasks(
-    limit: int = 25,
-    offset: int = 0,
+    request: Request,
+    response: Response,
+    limit: int = Query(25, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+    with_count: bool = False,
+    task_service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    if cursor is None:
+        tasks = await task_service.get_all(limit, offset)
+        next_cursor = get_next_cursor(tasks, limit)
+    else:
+        try:
+            tasks, next_cursor = await task_service.get_all_by_cursor(limit, cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if with_count:
+        total = await task_service.get_total_count()
+        response.headers["X-Total-Count"] = str(total.value)
+        response.headers["X-Total-Count-Strategy"] = total.strategy.value
+    validators = page_validators(
+        tasks,
+        response.headers.get("X-Next-Cursor"),
+        response.headers.get("X-Total-Count"),
+    )
+    if (unchanged := not_modified(request, validators)) is not None:
+        return unchanged
+    set_validators(response, validators)
+    return model_response(list[TaskListSchema], tasks, response)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_tasks(
+    format_: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
     task_service=Depends(get_task_service),
     current_user=Depends(get_current_user),
 ):
-    tasks = await task_service.get_all(limit, offset)
-    return tasks
+    return export_response(task_service, format_, "tasks")
 
 
 @router.post("", response_model=TaskDetailSchema, status_code=status.HTTP_201_CREATED)
@@ -33,37 +110,136 @@ async def create_task(
     return task
 
 
+@router.post(
+    "/bulk",
+    response_model=TaskBulkCreateResultSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_create_tasks(
+    items: list[dict[str, Any]],
+    task_service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    rows, positions, errors = _validate_bulk_items(items, TaskCreateSchema)
+    tasks, failed = await task_service.bulk_create(current_user, rows)
+    errors += [
+        BulkItemErrorSchema(index=positions[i], detail=detail)
+        for i, detail in failed.items()
+    ]
+    return {"items": tasks, "errors": sorted(errors, key=lambda e: e.index)}
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportResultSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def import_tasks(
+    request: Request,
+    format_: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    task_service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    # the body is parsed as it arrives and loaded chunk by chunk, each chunk
+    # committed on its own; error indexes are record positions in the upload
+    imported, errors = 0, []
+    records = iter_records(request.stream(), format_)
+    async for start, chunk in batched(records, task_service.import_chunk_size):
+        items, offsets = [], []
+        for offset, record in enumerate(chunk):
+            if isinstance(record, RecordError):
+                errors.append(BulkItemErrorSchema(index=start + offset, detail=record))
+            else:
+                items.append(record)
+                offsets.append(offset)
+        rows, positions, invalid = _validate_bulk_items(items, TaskCreateSchema)
+        errors += [
+            BulkItemErrorSchema(index=start + offsets[error.index], detail=error.detail)
+            for error in invalid
+        ]
+        count, failed = await task_service.bulk_import(current_user, rows)
+        imported += count
+        errors += [
+            BulkItemErrorSchema(index=start + offsets[positions[i]], detail=detail)
+            for i, detail in failed.items()
+        ]
+    return {"imported": imported, "errors": sorted(errors, key=lambda e: e.index)}
+
+
+@router.put(
+    "/bulk", response_model=TaskBulkResultSchema, status_code=status.HTTP_200_OK
+)
+async def bulk_update_tasks(
+    items: list[dict[str, Any]],
+    task_service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    rows, positions, errors = _validate_bulk_items(items, TaskBulkUpdateSchema)
+    ids, failed = await task_service.bulk_update(rows)
+    errors += [
+        BulkItemErrorSchema(index=positions[i], detail=detail)
+        for i, detail in failed.items()
+    ]
+    return {"ids": ids, "errors": sorted(errors, key=lambda e: e.index)}
+
+
+@router.post(
+    "/bulk/delete",
+    response_model=TaskBulkResultSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_delete_tasks(
+    ids: list[int],
+    task_service=Depends(get_task_service),
+    current_user=Depends(get_current_user),
+):
+    deleted, failed = await task_service.bulk_delete(ids)
+    errors = [
+        BulkItemErrorSchema(index=i, detail=detail) for i, detail in failed.items()
+    ]
+    return {"ids": deleted, "errors": errors}
+
+
 @router.get("/{pk}", response_model=TaskDetailSchema, status_code=status.HTTP_200_OK)
 async def get_task(
     pk: int,
+    request: Request,
+    response: Response,
     task_service=Depends(get_task_service),
     current_user=Depends(get_current_user),
 ):
+    if is_conditional(request):
+        # a revalidation that still matches never loads the row
+        updated_at = await task_service.get_updated_at(pk)
+        if updated_at is not None:
+            unchanged = not_modified(request, row_validators(Task, pk, updated_at))
+            if unchanged is not None:
+                return unchanged
     try:
-        return await task_service.get_by_id(pk)
+        task = await task_service.get_by_id(pk)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    set_validators(response, row_validators(Task, task.id, task.updated_at))
+    return model_response(TaskDetailSchema, task, response)
 
 
-@router.put(
-    "/{task_id}", response_model=TaskDetailSchema, status_code=status.HTTP_200_OK
-)
+@router.put("/{pk}", response_model=TaskDetailSchema, status_code=status.HTTP_200_OK)
 async def update_task(
     pk: int,
     task_data: TaskUpdateSchema,
     task_service=Depends(get_task_service),
     current_user=Depends(get_current_user),
 ):
-    task = await task_service.update(pk, **task_data.dict())
-    if task is None:
+    try:
+        return await task_service.update(pk, **task_data.dict())
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found",
+            detail=str(e),
         )
-    return task
 
 
 @router.delete("/{pk}", status_code=status.HTTP_204_NO_CONTENT)
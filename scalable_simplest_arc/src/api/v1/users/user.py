@@ -1,5 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from src.core.conditional import (
+    is_conditional,
+    not_modified,
+    page_validators,
+    row_validators,
+    set_validators,
+)
+from src.core.export import ExportFormat, export_response
+from src.core.paginate import MAX_PAGE_SIZE, get_next_cursor
+from src.core.responses import model_response
 from src.core.schemas.users import (
     UserCreateSchema,
     UserDetailSchema,
@@ -7,11 +17,24 @@ from src.core.schemas.users import (
     UserUpdatePasswordSchema,
     UserUpdateSchema,
 )
-from src.core.services.users import get_current_user, get_user_service
+from src.core.services.users import (
+    get_current_active_user,
+    get_current_user,
+    get_user_service,
+)
+from src.db.models.users import User
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+def _check_owner_or_admin(pk: int, current_user) -> None:
+    if current_user.id != pk and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the user or an admin can change this user",
+        )
+
+
 @router.get("/me", response_model=UserDetailSchema, status_code=status.HTTP_200_OK)
 async def get_me(
     current_user=Depends(get_current_user),
@@ -55,19 +78,65 @@ async def update_password(
 
 @router.get("", response_model=list[UserListSchema], status_code=status.HTTP_200_OK)
 async def get_users(
-    limit: int = 25,
-    offset: int = 0,
+    request: Request,
+    response: Response,
+    limit: int = Query(25, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+    with_count: bool = False,
     user_service=Depends(get_user_service),
 ):
-    users = await user_service.get_all(limit, offset)
-    return users
+    if cursor is None:
+        users = await user_service.get_all(limit, offset)
+        next_cursor = get_next_cursor(users, limit)
+    else:
+        try:
+            users, next_cursor = await user_service.get_all_by_cursor(limit, cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if with_count:
+        total = await user_service.get_total_count()
+        response.headers["X-Total-Count"] = str(total.value)
+        response.headers["X-Total-Count-Strategy"] = total.strategy.value
+    validators = page_validators(
+        users,
+        response.headers.get("X-Next-Cursor"),
+        response.headers.get("X-Total-Count"),
+    )
+    if (unchanged := not_modified(request, validators)) is not None:
+        return unchanged
+    set_validators(response, validators)
+    return model_response(list[UserListSchema], users, response)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_users(
+    format_: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    user_service=Depends(get_user_service),
+    current_user=Depends(get_current_user),
+):
+    return export_response(user_service, format_, "users")
 
 
 @router.get("/{pk}", response_model=UserDetailSchema, status_code=status.HTTP_200_OK)
 async def get_user(
     pk: int,
+    request: Request,
+    response: Response,
     user_service=Depends(get_user_service),
 ):
+    if is_conditional(request):
+        # a revalidation that still matches never loads the row
+        updated_at = await user_service.get_updated_at(pk)
+        if updated_at is not None:
+            unchanged = not_modified(request, row_validators(User, pk, updated_at))
+            if unchanged is not None:
+                return unchanged
     try:
         user = await user_service.get_by_id(pk)
     except ValueError as e:
@@ -75,7 +144,8 @@ async def get_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
-    return user
+    set_validators(response, row_validators(User, user.id, user.updated_at))
+    return model_response(UserDetailSchema, user, response)
 
 
 @router.post("", response_model=UserDetailSchema, status_code=status.HTTP_201_CREATED)
@@ -98,7 +168,9 @@ async def update_user(
     pk: int,
     user_data: UserUpdateSchema,
     user_service=Depends(get_user_service),
+    current_user=Depends(get_current_active_user),
 ):
+    _check_owner_or_admin(pk, current_user)
     try:
         user = await user_service.update(pk, **user_data.dict())
     except ValueError as e:
@@ -113,7 +185,9 @@ async def update_user(
 async def delete_user(
     pk: int,
     user_service=Depends(get_user_service),
+    current_user=Depends(get_current_active_user),
 ):
+    _check_owner_or_admin(pk, current_user)
     try:
         await user_service.delete(pk)
         return {"message": "User deleted successfully"}
@@ -0,0 +1,109 @@
+"""Validators and 304 responses for conditional GETs.
+
+A row's representation only changes when its ``updated_at`` does, so a
+detail ETag is derived from the table, id and ``updated_at``; a page's from
+its ids in order, the newest ``updated_at`` among them and the pagination
+headers. Lists get no Last-Modified: a row leaving the page does not move
+the newest timestamp.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, NamedTuple, Sequence
+
+from fastapi import Request, Response, status
+
+from src.core.metrics import CONDITIONAL_REQUESTS, route_template
+
+# clients revalidate on every use; the routes answer that with a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: datetime | None = None
+
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(
+        "\x1f".join(map(str, parts)).encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def row_validators(model: type, id_: int, updated_at: datetime) -> Validators:
+    return Validators(
+        _etag(model.__tablename__, id_, updated_at.isoformat()), updated_at
+    )
+
+
+def page_validators(rows: Sequence[Any], *extra: Any) -> Validators:
+    newest = max((row.updated_at for row in rows), default=None)
+    return Validators(
+        _etag(
+            ",".join(str(row.id) for row in rows),
+            newest.isoformat() if newest else "",
+            *extra,
+        )
+    )
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # updated_at is naive UTC; HTTP dates have whole seconds
+    modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+    return modified <= since
+
+
+def not_modified(request: Request, validators: Validators) -> Response | None:
+    """A 304 when the request's validators still match, else None.
+
+    Only requests carrying a validator are counted, as hits or misses.
+    """
+    if not is_conditional(request):
+        return None
+    # If-Modified-Since is ignored when If-None-Match is present
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, validators.etag)
+    elif validators.last_modified is not None:
+        matched = _not_modified_since(
+            request.headers["if-modified-since"], validators.last_modified
+        )
+    else:
+        matched = False
+    CONDITIONAL_REQUESTS.labels(
+        route_template(request.scope), "hit" if matched else "miss"
+    ).inc()
+    if not matched:
+        return None
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, validators)
+    return response
+
+
+def set_validators(response: Response, validators: Validators) -> None:
+    response.headers["ETag"] = validators.etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if validators.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            validators.last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
@@ -1,4 +1,6 @@
-from pydantic import PostgresDsn, RedisDsn, SecretStr
+from typing import Literal
+
+from pydantic import PostgresDsn, RedisDsn, SecretStr, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -10,9 +12,95 @@ class Settings(BaseSettings):
     secret_key: SecretStr
     algorithm: str
     access_token_expire_minutes: int
+    # per-worker cache of verified tokens; the TTL also bounds how long another
+    # worker can keep serving a principal that was updated elsewhere
+    auth_cache_size: int = 10_000
+    auth_cache_ttl: float = 300.0
+    # pbkdf2 runs in a process pool per worker; calls beyond the pending cap
+    # are rejected with 503 instead of queueing behind a login storm
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+    # list/detail routes serialize ORM rows in one pydantic-core pass and the
+    # remaining routes render with orjson
+    fast_responses: bool = False
+    # precomputed /openapi.json, see src/core/openapi.py
+    openapi_file: str | None = None
+
+    # records are queued and written by a listener thread; when the queue is
+    # full they are dropped (and counted) rather than blocking the request
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_queue_size: int = 10_000
+    # fraction of records below WARNING kept per logger name
+    log_sample_rates: dict[str, float] = {}
+    # per call site; 0 disables the limit
+    log_rate_limit_per_second: float = 10.0
+    log_rate_limit_burst: int = 20
 
-    postgres_uri: PostgresDsn
+    # /metrics; under gunicorn also set PROMETHEUS_MULTIPROC_DIR
+    metrics_enabled: bool = True
+    metrics_sample_interval: float = 1.0
+    # debug only: X-DB-Query-Count / X-DB-Time response headers and a warning
+    # for statements repeated this many times in one request (probable N+1)
+    db_profiling: bool = False
+    db_repeated_query_threshold: int = 5
+    # log statements slower than this with their bind parameters; 0 disables
+    db_slow_query_ms: float = 0
+
+    # "sqlite" runs on an embedded database file so tests and benchmarks need
+    # no server; see src/db/sqlite.py
+    database_backend: Literal["postgres", "sqlite"] = "postgres"
+    postgres_uri: PostgresDsn | None = None
+    # read-only service methods are spread over these; empty means primary only
+    postgres_replica_uris: list[PostgresDsn] = []
+    db_replica_ejection_seconds: float = 30.0
     redis_uri: RedisDsn
+    # cache-aside store for get_by_id on services that set cache_ttl:
+    # "redis", "memory" (per worker, no cross-worker invalidation) or "none";
+    # off unless chosen
+    row_cache_backend: Literal["redis", "memory", "none"] = "none"
+    row_cache_missing_ttl: float = 5.0
+    # seconds; a slow or unreachable Redis costs at most this per call and the
+    # read falls through to the database as a miss
+    row_cache_timeout: float = 0.05
+
+    # gunicorn reads the same variable, so the pool can be sized per worker
+    web_concurrency: int = 1
+    # every setting below applies to one worker process; when a budget is
+    # set it caps pool_size + max_overflow at budget // web_concurrency
+    db_connection_budget: int | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    # transaction-mode pgbouncer: no client-side pool, no prepared statements
+    db_pgbouncer: bool = False
+
+    sqlite_path: str = "ssa.db"
+    # WAL lets these read while the single write connection commits
+    sqlite_readers: int = 4
+    sqlite_busy_timeout_ms: int = 5000
+
+    @model_validator(mode="after")
+    def check_database(self) -> "Settings":
+        if self.database_backend == "postgres" and self.postgres_uri is None:
+            raise ValueError("postgres_uri is required for the postgres backend")
+        return self
+
+    @property
+    def database_uri(self) -> str:
+        if self.database_backend == "sqlite":
+            return f"sqlite+aiosqlite:///{self.sqlite_path}"
+        return str(self.postgres_uri)
+
+    def db_pool_limits(self) -> tuple[int, int]:
+        if self.db_connection_budget is None:
+            return self.db_pool_size, self.db_max_overflow
+        per_worker = max(self.db_connection_budget // self.web_concurrency, 1)
+        pool_size = min(self.db_pool_size, per_worker)
+        return pool_size, per_worker - pool_size
 
     class Config:
         env_file = ".env"
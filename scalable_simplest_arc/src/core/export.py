@@ -0,0 +1,70 @@
+import csv
+import enum
+import io
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def encode_rows(
+    names: Sequence[str],
+    batches: AsyncIterator[Sequence[Sequence[Any]]],
+    format_: ExportFormat,
+) -> AsyncIterator[bytes]:
+    # one chunk per fetched batch keeps memory bounded by the batch size;
+    # aclosing() releases the cursor and its connection when the client goes
+    # away mid-export
+    async with aclosing(batches):
+        if format_ is ExportFormat.NDJSON:
+            async for rows in batches:
+                yield b"".join(
+                    orjson.dumps(
+                        dict(zip(names, row)), option=orjson.OPT_APPEND_NEWLINE
+                    )
+                    for row in rows
+                )
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        async for rows in batches:
+            writer.writerows([_csv_value(value) for value in row] for row in rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+
+def export_response(service, format_: ExportFormat, filename: str) -> StreamingResponse:
+    names = [column.key for column in service.get_export_columns()]
+    return StreamingResponse(
+        encode_rows(names, service.stream_all(), format_),
+        media_type=MEDIA_TYPES[format_],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format_.value}"'
+        },
+    )
@@ -0,0 +1,121 @@
+import codecs
+import csv
+from typing import Any, AsyncIterator
+
+import orjson
+
+from src.core.export import ExportFormat
+
+# a quoted CSV field or NDJSON line may not grow past this while buffered
+MAX_RECORD_SIZE = 1 << 20
+
+
+class RecordError(str):
+    """Stands in for a record that could not be parsed; the value is the detail."""
+
+
+def _split_records(text: str) -> tuple[list[str], str]:
+    # newlines inside a quoted field do not end a CSV record, so a record is
+    # complete once it ends on a newline with an even number of quotes
+    records, start, position, quoted = [], 0, 0, False
+    while (end := text.find("\n", position)) != -1:
+        quoted ^= text.count('"', position, end) % 2 == 1
+        position = end + 1
+        if not quoted:
+            records.append(text[start:position])
+            start = position
+    return records, text[start:]
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header, pending = None, ""
+    done = False
+    while not done:
+        try:
+            chunk = await anext(chunks)
+            text = pending + decoder.decode(chunk)
+        except StopAsyncIteration:
+            text, done = pending + decoder.decode(b"", final=True), True
+        records, pending = _split_records(text)
+        if done and pending.strip():
+            records.append(pending)
+        elif len(pending) > MAX_RECORD_SIZE:
+            yield RecordError("Record too large or unterminated quote")
+            return
+        reader = csv.reader(records)
+        while True:
+            try:
+                fields = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                yield RecordError(f"Invalid CSV: {e}")
+                continue
+            if not fields:
+                continue
+            if header is None:
+                header = fields
+            elif len(fields) != len(header):
+                yield RecordError(f"Expected {len(header)} fields, got {len(fields)}")
+            else:
+                yield {
+                    name: value if value != "" else None
+                    for name, value in zip(header, fields)
+                }
+
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    pending = b""
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(b"\n")
+        if len(pending) > MAX_RECORD_SIZE:
+            yield RecordError("Record too large")
+            return
+        for line in lines:
+            if line.strip():
+                yield _ndjson_record(line)
+    if pending.strip():
+        yield _ndjson_record(pending)
+
+
+def _ndjson_record(line: bytes) -> Any:
+    try:
+        record = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        return RecordError(f"Invalid JSON: {e}")
+    if not isinstance(record, dict):
+        return RecordError("Expected a JSON object")
+    return record
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], format_: ExportFormat
+) -> AsyncIterator[dict[str, Any] | RecordError]:
+    """Parse an upload as it arrives; only one unfinished record is buffered.
+
+    CSV needs a header row; empty fields become None. Blank lines are skipped
+    and do not count towards record positions.
+    """
+    chunks = aiter(chunks)
+    if format_ is ExportFormat.CSV:
+        records = _csv_records(chunks)
+    else:
+        records = _ndjson_records(chunks)
+    async for record in records:
+        yield record
+
+
+async def batched(
+    records: AsyncIterator[Any], size: int
+) -> AsyncIterator[tuple[int, list[Any]]]:
+    # (position of the first record, records), like chunked() for iterators
+    batch, start = [], 0
+    async for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield start, batch
+            start += size
+            batch = []
+    if batch:
+        yield start, batch
@@ -0,0 +1,217 @@
+import asyncio
+import os
+from dataclasses import asdict
+from typing import Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.db.pool import PoolStats
+from src.db.profiler import RequestDBStats, query_observers
+from src.logger import logging_pipeline
+
+# gunicorn workers write to files in this directory and /metrics aggregates
+# them; it has to be set before prometheus_client is imported
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# the route template, never the raw path, keeps label cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+# hit rate: result="hit" over all results, per route
+CONDITIONAL_REQUESTS = Counter(
+    "http_conditional_requests_total",
+    "GETs carrying If-None-Match or If-Modified-Since",
+    ["route", "result"],
+)
+DB_QUERIES = Counter("db_queries_total", "Database queries", ["route"])
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "Database queries per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Database time per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database query latency",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+# engine is "primary" or "replica-<n>", as on the admin pool route
+POOL_SIZE = Gauge("db_pool_size", "Pool size", ["engine"], multiprocess_mode="livesum")
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections in use",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections above pool size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Pool checkouts", ["engine"])
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Pool checkout timeouts", ["engine"])
+POOL_WAIT = Counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for the pool", ["engine"]
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Event loop scheduling delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Password hashes and verifies submitted and not yet finished",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password operations waiting for a hasher worker",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_OPERATIONS = Counter(
+    "password_hash_operations_total",
+    "Password hashes and verifies run",
+    ["result"],
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Password operations refused with a 503"
+)
+PASSWORD_HASH_RESTARTS = Counter(
+    "password_hash_pool_restarts_total", "Hasher pools replaced after a worker died"
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped on a full queue"
+)
+
+
+query_observers.append(DB_QUERY_DURATION.observe)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+def observe_request(
+    method: str, route: str, status: int, elapsed: float, db: RequestDBStats
+) -> None:
+    REQUESTS.labels(method, route, status).inc()
+    REQUEST_DURATION.labels(method, route, status).observe(elapsed)
+    DB_QUERIES.labels(route).inc(db.queries)
+    DB_QUERIES_PER_REQUEST.labels(route).observe(db.queries)
+    DB_TIME_PER_REQUEST.labels(route).observe(db.seconds)
+
+
+class Monitor:
+    """Samples event-loop lag, pool, hasher and log state on a fixed interval."""
+
+    def __init__(
+        self,
+        engines: list[tuple[str, AsyncEngine]],
+        interval: float,
+        hasher_stats: Callable[[], dict],
+    ):
+        self.engines = engines
+        self.interval = interval
+        self.hasher_stats = hasher_stats
+        self._last_pools = {name: PoolStats() for name, _ in engines}
+        self._last = {
+            "dropped": 0,
+            "hash_completed": 0,
+            "hash_failed": 0,
+            "hash_rejected": 0,
+            "hash_restarts": 0,
+        }
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(loop.time() - started - self.interval, 0.0))
+            self.sample()
+
+    def sample(self) -> None:
+        for name, engine in self.engines:
+            self._sample_pool(name, engine.pool)
+        hasher = self.hasher_stats()
+        PASSWORD_HASH_IN_FLIGHT.set(hasher["in_flight"])
+        PASSWORD_HASH_QUEUE_DEPTH.set(hasher["queue_depth"])
+        # the sources keep running totals; counters get the deltas
+        current = {
+            "dropped": logging_pipeline.snapshot()["dropped"],
+            "hash_completed": hasher["completed"],
+            "hash_failed": hasher["failed"],
+            "hash_rejected": hasher["rejected"],
+            "hash_restarts": hasher["restarts"],
+        }
+        LOG_RECORDS_DROPPED.inc(max(current["dropped"] - self._last["dropped"], 0))
+        PASSWORD_HASH_OPERATIONS.labels("completed").inc(
+            current["hash_completed"] - self._last["hash_completed"]
+        )
+        PASSWORD_HASH_OPERATIONS.labels("failed").inc(
+            current["hash_failed"] - self._last["hash_failed"]
+        )
+        PASSWORD_HASH_REJECTED.inc(
+            current["hash_rejected"] - self._last["hash_rejected"]
+        )
+        PASSWORD_HASH_RESTARTS.inc(
+            current["hash_restarts"] - self._last["hash_restarts"]
+        )
+        self._last = current
+
+    def _sample_pool(self, name: str, pool: Pool) -> None:
+        if isinstance(pool, QueuePool):
+            POOL_SIZE.labels(name).set(pool.size())
+            POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+            POOL_OVERFLOW.labels(name).set(max(pool.overflow(), 0))
+        # uninstrumented pools (NullPool behind pgbouncer) have no stats
+        stats = getattr(pool, "stats", None)
+        if stats is None:
+            return
+        last = self._last_pools[name]
+        POOL_CHECKOUTS.labels(name).inc(stats.checkouts - last.checkouts)
+        POOL_TIMEOUTS.labels(name).inc(stats.timeouts - last.timeouts)
+        POOL_WAIT.labels(name).inc(stats.wait_seconds_total - last.wait_seconds_total)
+        self._last_pools[name] = PoolStats(**asdict(stats))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
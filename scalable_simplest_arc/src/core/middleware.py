@@ -0,0 +1,121 @@
+import time
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.metrics import REQUESTS_IN_PROGRESS, observe_request, route_template
+from src.db.profiler import track_queries
+from src.logger import logger, request_id_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+DB_QUERY_COUNT_HEADER = "X-DB-Query-Count"
+DB_TIME_HEADER = "X-DB-Time"
+
+
+class RequestIdMiddleware:
+    """Tags every log record of a request with its id and echoes it back.
+
+    A well-formed X-Request-ID from the client (or a proxy) is reused, so the
+    id can be followed across services.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or len(request_id) > 128 or not request_id.isprintable():
+            request_id = uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+class MetricsMiddleware:
+    """Request count, latency and DB usage by route template and status."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        with track_queries() as db:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - started
+                in_progress.dec()
+                observe_request(method, route_template(scope), status_code, elapsed, db)
+
+
+class DBProfilerMiddleware:
+    """Debug aid: per-request query count and time as response headers.
+
+    The headers are written when the response starts, so a streamed body's
+    queries are not in them. Statements run at least
+    ``db_repeated_query_threshold`` times in one request are logged as a
+    probable N+1.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(profile=True) as db:
+
+            async def send_with_db_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers[DB_QUERY_COUNT_HEADER] = str(db.queries)
+                    headers[DB_TIME_HEADER] = f"{db.seconds * 1000:.3f}ms"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_db_stats)
+            finally:
+                for statement, count in db.repeated(
+                    settings.db_repeated_query_threshold
+                ):
+                    logger.warning(
+                        "Probable N+1: statement repeated within one request",
+                        route=route_template(scope),
+                        count=count,
+                        sql=statement,
+                    )
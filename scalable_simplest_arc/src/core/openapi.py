@@ -0,0 +1,101 @@
+"""Serve the OpenAPI document from a file generated once, with an ETag.
+
+Generate it where the deployment's settings are available (CI, image
+build, release step) and point OPENAPI_FILE at it::
+
+    python -m src.core.openapi openapi.json
+
+The file records a fingerprint of the application source. A missing file,
+or one generated from other code or for a different title, description or
+version, is ignored with a warning and the document is built in-process on
+the first request, as FastAPI would.
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import orjson
+from fastapi import FastAPI, Request, Response
+
+from src.logger import logger
+
+SOURCE_ROOT = Path(__file__).resolve().parents[1]
+FINGERPRINT_KEY = "x-source-fingerprint"
+
+
+def source_fingerprint() -> str:
+    # routes and schemas are defined by the code, so any change to it may
+    # change the document; a few milliseconds, paid on the first request
+    digest = hashlib.sha256()
+    for path in sorted(SOURCE_ROOT.rglob("*.py")):
+        digest.update(str(path.relative_to(SOURCE_ROOT)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def build_openapi(app: FastAPI) -> bytes:
+    # app.openapi() caches its dict, so the fingerprint goes into a copy
+    document = app.openapi()
+    document = {
+        **document,
+        "info": {**document["info"], FINGERPRINT_KEY: source_fingerprint()},
+    }
+    return orjson.dumps(document, option=orjson.OPT_SORT_KEYS)
+
+
+class OpenAPIDocument:
+    def __init__(self, app: FastAPI, path: str | None):
+        self.app = app
+        self.path = Path(path) if path else None
+        self._body: bytes | None = None
+        self._etag: str | None = None
+
+    def _load(self) -> bytes | None:
+        if self.path is None:
+            return None
+        try:
+            body = self.path.read_bytes()
+            info = orjson.loads(body)["info"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring OpenAPI file {self.path}: {e}")
+            return None
+        expected = {
+            "title": self.app.title,
+            "description": self.app.description,
+            "version": self.app.version,
+        }
+        if {key: info.get(key) for key in expected} != expected:
+            logger.warning(f"Ignoring OpenAPI file {self.path}: generated elsewhere")
+            return None
+        if info.get(FINGERPRINT_KEY) != source_fingerprint():
+            logger.warning(
+                f"Ignoring OpenAPI file {self.path}: generated from other code"
+            )
+            return None
+        return body
+
+    def body(self) -> tuple[bytes, str]:
+        if self._body is None:
+            self._body = self._load() or build_openapi(self.app)
+            self._etag = f'"{hashlib.sha256(self._body).hexdigest()[:32]}"'
+        return self._body, self._etag
+
+    def response(self, request: Request) -> Response:
+        body, etag = self.body()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+
+def main() -> None:
+    from src.main import app
+
+    path = Path(sys.argv[1] if len(sys.argv) > 1 else "openapi.json")
+    path.write_bytes(build_openapi(app))
+    print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
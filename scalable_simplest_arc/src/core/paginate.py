@@ -1,3 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, NamedTuple, Sequence
+
+# larger limits on the list routes are a 422
+MAX_PAGE_SIZE = 100
+
+
+class CountStrategy(str, Enum):
+    # SELECT count(*), always correct but scans the whole table
+    EXACT = "exact"
+    # trigger-maintained row in table_row_counts, exact and O(1)
+    COUNTER = "counter"
+    # planner statistics (pg_class.reltuples), approximate and O(1)
+    ESTIMATED = "estimated"
+    # exact count memoised per process for a short TTL
+    CACHED = "cached"
+
+
+class TotalCount(NamedTuple):
+    value: int
+    strategy: CountStrategy
+
+
 def paginate(page: int, page_size: int, total_count: int):
-    page_count = total_count // page_size + 1
+    page_count = max(-(-total_count // page_size), 1)
     return page_count
+
+
+def encode_cursor(created_at: datetime, id_: int) -> str:
+    raw = json.dumps([created_at.isoformat(), id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id_ = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id_)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_next_cursor(instances: Sequence[Any], limit: int) -> str | None:
+    # a short page means there is nothing left to fetch
+    if not instances or len(instances) < limit:
+        return None
+    last = instances[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import Any, Callable, get_args, get_origin
+
+import orjson
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+from src.core.config import settings
+
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+
+def _is_flat(schema: type[BaseModel]) -> bool:
+    # scalar-only schemas without aliases or custom serializers can be dumped
+    # straight from ORM attributes; anything else needs pydantic
+    decorators = schema.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers:
+        return False
+    for field in schema.model_fields.values():
+        if field.alias is not None:
+            return False
+        types = [field.annotation]
+        while types:
+            type_ = types.pop()
+            if isinstance(type_, type) and issubclass(type_, BaseModel):
+                return False
+            types.extend(get_args(type_))
+    return True
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+@lru_cache(maxsize=None)
+def get_encoder(type_: Any) -> Callable[[Any], bytes]:
+    many = get_origin(type_) is list
+    schema = get_args(type_)[0] if many else type_
+
+    if not _is_flat(schema):
+        adapter = get_type_adapter(type_)
+        return lambda content: adapter.dump_json(
+            adapter.validate_python(content, from_attributes=True)
+        )
+
+    fields = tuple(schema.model_fields)
+    if many:
+        return lambda rows: orjson.dumps(
+            [{field: getattr(row, field) for field in fields} for row in rows]
+        )
+    return lambda row: orjson.dumps({field: getattr(row, field) for field in fields})
+
+
+def model_response(
+    type_: Any,
+    content: Any,
+    response: Response | None = None,
+    status_code: int = status.HTTP_200_OK,
+) -> Any:
+    # returning a Response makes FastAPI skip its response_model pass
+    # (validate, jsonable_encoder, json.dumps); our own ORM rows are trusted,
+    # so flat schemas are encoded from attributes by orjson in one step and
+    # response_model is left to document the route
+    if not settings.fast_responses:
+        return content
+    fast_response = JSONBytesResponse(
+        get_encoder(type_)(content), status_code=status_code
+    )
+    if response is not None:
+        fast_response.headers.raw.extend(response.headers.raw)
+    return fast_response
@@ -0,0 +1,2 @@
+from src.core.schemas.admin.cache import RowCacheStatsSchema, SingleFlightStatsSchema
+from src.core.schemas.admin.pool import PoolsStatusSchema, PoolStatusSchema
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class RowCacheStatsSchema(BaseModel):
+    hits: int
+    negative_hits: int
+    misses: int
+    errors: int
+
+
+class SingleFlightStatsSchema(BaseModel):
+    leaders: int
+    coalesced: int
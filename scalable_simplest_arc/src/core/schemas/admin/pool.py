@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class PoolStatusSchema(BaseModel):
+    engine: str
+    pool_class: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    timeout: float | None = None
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class PoolsStatusSchema(BaseModel):
+    pid: int
+    pools: list[PoolStatusSchema]
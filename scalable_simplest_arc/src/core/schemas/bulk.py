@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class BulkItemErrorSchema(BaseModel):
+    index: int
+    detail: str
@@ -1,6 +1,10 @@
 from src.core.schemas.tasks.task import (
+    TaskBulkCreateResultSchema,
+    TaskBulkResultSchema,
+    TaskBulkUpdateSchema,
     TaskCreateSchema,
     TaskDetailSchema,
+    TaskImportResultSchema,
     TaskListSchema,
     TaskUpdateSchema,
 )
@@ -2,6 +2,7 @@ from enum import Enum
 
 from pydantic import BaseModel
 
+from src.core.schemas.bulk import BulkItemErrorSchema
 from src.db.models.tasks import TaskStatus
 
 
@@ -26,3 +27,22 @@ class TaskListSchema(TaskBaseSchema):
 
 class TaskDetailSchema(TaskBaseSchema):
     id: int
+
+
+class TaskBulkUpdateSchema(TaskBaseSchema):
+    id: int
+
+
+class TaskBulkCreateResultSchema(BaseModel):
+    items: list[TaskDetailSchema]
+    errors: list[BulkItemErrorSchema]
+
+
+class TaskBulkResultSchema(BaseModel):
+    ids: list[int]
+    errors: list[BulkItemErrorSchema]
+
+
+class TaskImportResultSchema(BaseModel):
+    imported: int
+    errors: list[BulkItemErrorSchema]
@@ -1,4 +1,4 @@
-from src.core.schemas.users.auth import Token, TokenData
+from src.core.schemas.users.auth import Token, TokenData, UserPrincipalSchema
 from src.core.schemas.users.user import (
     UserCreateSchema,
     UserDetailSchema,
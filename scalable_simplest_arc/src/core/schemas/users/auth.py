@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Token(BaseModel):
@@ -8,3 +8,14 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str
+
+
+class UserPrincipalSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: int
+    username: str
+    first_name: str
+    last_name: str
+    is_active: bool
+    is_admin: bool
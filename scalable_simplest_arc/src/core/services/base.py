@@ -1,95 +1,417 @@
+import enum
 from abc import ABC
-from typing import Any, Generic, Sequence, Tuple, Type, TypeVar
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Generic, Sequence, Tuple, Type, TypeVar
 
 from fastapi import HTTPException
-from sqlalchemy import Row, delete, func, update
+from sqlalchemy import Result, Row, delete, func, insert, text, tuple_, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from src.core.config import settings
+from src.core.paginate import CountStrategy, TotalCount, decode_cursor, get_next_cursor
+from src.core.services.cache import row_cache
+from src.core.services.singleflight import coalesce
+from src.db.db import after_commit, commit, replica_router
+from src.db.models.counters import table_row_counts
+from src.db.replicas import is_disconnect, is_stuck_to_primary, stick_to_primary
 from src.logger import logger
+from src.utils.cache import TTLCache
 
 # Define a generic variable for your model
 T = TypeVar("T")
 
+count_cache = TTLCache(maxsize=128)
+
+
+def chunked(items: Sequence[Any], size: int):
+    for start in range(0, len(items), size):
+        yield start, items[start : start + size]
+
 
 class AbstractBaseService(ABC, Generic[T]):
+    count_strategy: CountStrategy = CountStrategy.EXACT
+    count_cache_ttl: float = 5.0
+    bulk_chunk_size: int = 1000
+    import_chunk_size: int = 5000
+    # loader options for list and detail reads, e.g. load_only() to project
+    # list pages down to the columns their schema needs
+    list_options: tuple = ()
+    detail_options: tuple = ()
+    # seconds get_by_id rows stay in row_cache; None keeps the model uncached
+    cache_ttl: float | None = None
+    # columns never written to the cache; they are unloaded on cached rows
+    cache_exclude: tuple[str, ...] = ()
+    # columns written by stream_all, every table column when None
+    export_columns: tuple | None = None
+    export_batch_size: int = 1000
+
     def __init__(self, session: AsyncSession, model: Type[T]):
         self.session = session
         self.model = model
 
     async def create(self, **kwargs) -> T:
+        # INSERT ... RETURNING hands back the row with its generated columns,
+        # so no refresh SELECT is needed before the response is built
+        stick_to_primary()
+        query = insert(self.model).values(**kwargs).returning(self.model)
         try:
-            instance = self.model(**kwargs)
-            self.session.add(instance)
-            await self.session.commit()
-            await self.session.refresh(instance)
-            return instance
+            instance = await self.session.scalar(query)
         except IntegrityError:
             await self.session.rollback()
             raise HTTPException(
                 status_code=400, detail="Relationship with specified ID does not exist"
             )
+        # the new id may still be cached as missing
+        self.invalidate_cache([instance.id])
+        return instance
+
+    async def validate_bulk(self, items: Sequence[dict[str, Any]]) -> dict[int, str]:
+        # errors keyed by position in `items` for rows that must not be written
+        return {}
+
+    async def bulk_create(
+        self, items: Sequence[dict[str, Any]]
+    ) -> Tuple[list[T], dict[int, str]]:
+        instances, errors = [], {}
+        stick_to_primary()
+        for start, chunk in chunked(items, self.bulk_chunk_size):
+            rejected = await self.validate_bulk(chunk)
+            errors.update({start + i: detail for i, detail in rejected.items()})
+            rows = [item for i, item in enumerate(chunk) if i not in rejected]
+            if not rows:
+                continue
+            # executemany of an ORM insert is sent as multi-row
+            # INSERT ... VALUES ... RETURNING batches
+            query = insert(self.model).returning(
+                self.model, sort_by_parameter_order=True
+            )
+            try:
+                async with self.session.begin_nested():
+                    result = await self.session.scalars(query, rows)
+                    created = result.all()
+            except IntegrityError as e:
+                logger.error(f"Error executing bulk insert: {e}")
+                errors.update(self._chunk_errors(start, chunk, rejected))
+                continue
+            instances.extend(created)
+            self.invalidate_cache([instance.id for instance in created])
+        return instances, errors
 
-    async def update(self, id_: int, **kwargs) -> None:
-        async with self.session:
-            update(self.model).where(self.model.id == id_).values(**kwargs)
-            await self.session.commit()
+    async def bulk_update(
+        self, items: Sequence[dict[str, Any]]
+    ) -> Tuple[list[int], dict[int, str]]:
+        updated, errors = [], {}
+        stick_to_primary()
+        for start, chunk in chunked(items, self.bulk_chunk_size):
+            rejected = await self.validate_bulk(chunk)
+            existing = set(
+                await self.session.scalars(
+                    select(self.model.id).where(
+                        self.model.id.in_([item["id"] for item in chunk])
+                    )
+                )
+            )
+            for i, item in enumerate(chunk):
+                if i not in rejected and item["id"] not in existing:
+                    rejected[i] = f"{self.model.__name__} not found"
+            errors.update({start + i: detail for i, detail in rejected.items()})
+            rows = [item for i, item in enumerate(chunk) if i not in rejected]
+            if not rows:
+                continue
+            # bulk UPDATE by primary key, sent as a single executemany
+            try:
+                async with self.session.begin_nested():
+                    await self.session.execute(update(self.model), rows)
+            except IntegrityError as e:
+                logger.error(f"Error executing bulk update: {e}")
+                errors.update(self._chunk_errors(start, chunk, rejected))
+                continue
+            updated.extend(item["id"] for item in rows)
+            self.invalidate_cache([item["id"] for item in rows])
+        return updated, errors
+
+    async def bulk_delete(self, ids: Sequence[int]) -> Tuple[list[int], dict[int, str]]:
+        deleted, errors = [], {}
+        stick_to_primary()
+        for start, chunk in chunked(ids, self.bulk_chunk_size):
+            query = (
+                delete(self.model)
+                .where(self.model.id.in_(chunk))
+                .returning(self.model.id)
+            )
+            try:
+                async with self.session.begin_nested():
+                    result = await self.session.scalars(query)
+                    removed = set(result.all())
+            except IntegrityError as e:
+                logger.error(f"Error executing bulk delete: {e}")
+                errors.update(self._chunk_errors(start, chunk, {}))
+                continue
+            self.invalidate_cache(removed)
+            for i, id_ in enumerate(chunk):
+                if id_ in removed:
+                    deleted.append(id_)
+                else:
+                    errors[start + i] = f"{self.model.__name__} not found"
+        return deleted, errors
+
+    async def bulk_import(
+        self, items: Sequence[dict[str, Any]]
+    ) -> Tuple[int, dict[int, str]]:
+        # loads and commits one chunk of an import, so the row counter the
+        # insert trigger updates is not locked while the rest of the upload
+        # arrives; rows never become ORM instances, so the identity map stays
+        # empty however large the upload is
+        stick_to_primary()
+        rejected = await self.validate_bulk(items)
+        for i, item in enumerate(items):
+            if i not in rejected and (detail := self._length_error(item)):
+                rejected[i] = detail
+        now = datetime.utcnow()
+        rows = [
+            {**item, "created_at": now, "updated_at": now, "is_active": True}
+            for i, item in enumerate(items)
+            if i not in rejected
+        ]
+        ids = []
+        if rows:
+            try:
+                async with self.session.begin_nested():
+                    ids = await self._load_rows(rows)
+            except IntegrityError as e:
+                logger.error(f"Error executing import: {e}")
+                rejected = {**rejected, **self._chunk_errors(0, items, rejected)}
+            else:
+                self.invalidate_cache(ids)
+        await commit(self.session)
+        return len(ids), rejected
+
+    async def _load_rows(self, rows: Sequence[dict[str, Any]]) -> list[int]:
+        connection = await self.session.connection()
+        if connection.dialect.driver != "asyncpg":
+            result = await self.session.scalars(
+                insert(self.model).returning(self.model.id), rows
+            )
+            return result.all()
+
+        # COPY into a staging table shaped like the target, then merge with a
+        # single INSERT ... SELECT so constraints are checked set-wise; the
+        # table is dropped again so the next chunk's savepoint can recreate it
+        table = self.model.__tablename__
+        staging = f"{table}_import"
+        columns = list(rows[0])
+        column_list = ", ".join(columns)
+        await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM {table} WITH NO DATA"
+            )
+        )
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging,
+            records=[
+                tuple(
+                    value.name if isinstance(value, enum.Enum) else value
+                    for value in (row[column] for column in columns)
+                )
+                for row in rows
+            ],
+            columns=columns,
+        )
+        result = await self.session.scalars(
+            text(
+                f"INSERT INTO {table} ({column_list}) "
+                f"SELECT {column_list} FROM {staging} RETURNING id"
+            )
+        )
+        ids = result.all()
+        await self.session.execute(text(f"DROP TABLE {staging}"))
+        return ids
+
+    def _length_error(self, item: dict[str, Any]) -> str | None:
+        for key, value in item.items():
+            length = getattr(self.model.__table__.c[key].type, "length", None)
+            if isinstance(value, str) and length and len(value) > length:
+                return f"{key}: longer than {length} characters"
+        return None
+
+    def _chunk_errors(
+        self, start: int, chunk: Sequence[Any], rejected: dict[int, str]
+    ) -> dict[int, str]:
+        detail = f"{self.model.__name__} batch violates a database constraint"
+        return {start + i: detail for i in range(len(chunk)) if i not in rejected}
+
+    async def update(self, id_: int, **kwargs) -> T:
+        stick_to_primary()
+        query = (
+            update(self.model)
+            .where(self.model.id == id_)
+            .values(**kwargs)
+            .returning(self.model)
+        )
+        try:
+            instance = await self.session.scalar(query)
+        except IntegrityError:
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail="Relationship with specified ID does not exist",
+            )
+        if instance is None:
+            raise ValueError(f"{self.model.__name__} not found")
+        self.invalidate_cache([id_])
+        return instance
 
     async def get_and_update(self, id_: int, **kwargs) -> T:
-        async with self.session:
-            instance = await self.get_by_id(id_)
-            for key, value in kwargs.items():
-                setattr(instance, key, value)
-            self.session.add(instance)
-            await self.session.commit()
-            await self.session.refresh(instance)
-            return instance
+        return await self.update(id_, **kwargs)
 
     async def delete(self, id_: int) -> None:
-        async with self.session:
-            delete(self.model).where(self.model.id == id_)
-            await self.session.commit()
+        stick_to_primary()
+        query = delete(self.model).where(self.model.id == id_).returning(self.model.id)
+        try:
+            deleted_id = await self.session.scalar(query)
+        except IntegrityError:
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"{self.model.__name__} is still referenced by other rows",
+            )
+        if deleted_id is None:
+            raise ValueError(f"{self.model.__name__} not found")
+        self.invalidate_cache([id_])
 
     async def get_and_delete(self, id_: int) -> None:
-        async with self.session:
-            instance = await self.get_by_id(id_)
-            await self.session.delete(instance)
-            await self.session.commit()
-
-    async def get_by_id(self, id_: int) -> T:
-        async with self.session:
-            query = select(self.model).where(self.model.id == id_)
-            result = await self.session.execute(query)
-            instance = result.scalars().first()
-            if not instance:
-                raise ValueError(f"{self.model.__name__} not found")
-            return instance
+        await self.delete(id_)
+
+    @coalesce
+    async def get_by_id(
+        self, id_: int, options: Sequence = (), cached: bool = True
+    ) -> T:
+        # cached rows carry columns only, so reads that load relationships
+        # bypass the cache; so do requests that wrote, whose invalidations
+        # only run after their commit
+        cached = (
+            cached
+            and self.cache_ttl is not None
+            and not is_stuck_to_primary()
+            and not self.detail_options
+            and not options
+        )
+        if cached:
+            hit, instance = await row_cache.get(self.model, id_)
+            if hit:
+                if instance is None:
+                    raise ValueError(f"{self.model.__name__} not found")
+                return instance
+
+        query = (
+            select(self.model)
+            .where(self.model.id == id_)
+            .options(*self.detail_options, *options)
+        )
+        instance = await self._read(query, lambda result: result.scalars().first())
+        if cached:
+            # a lagging replica can refill an entry with a pre-write row; the
+            # TTL bounds how long that survives
+            ttl = self.cache_ttl if instance else settings.row_cache_missing_ttl
+            await row_cache.set(
+                self.model, id_, instance, ttl, exclude=self.cache_exclude
+            )
+        if not instance:
+            raise ValueError(f"{self.model.__name__} not found")
+        return instance
+
+    @coalesce
+    async def get_updated_at(self, id_: int) -> datetime | None:
+        # enough to answer a conditional GET: the cached row when there is
+        # one, otherwise a single column instead of the whole row
+        if self.cache_ttl is not None and not is_stuck_to_primary():
+            hit, instance = await row_cache.get(self.model, id_)
+            if hit:
+                return instance.updated_at if instance is not None else None
+        query = select(self.model.updated_at).where(self.model.id == id_)
+        return await self._read(query, lambda result: result.scalar())
+
+    def invalidate_cache(self, ids) -> None:
+        if self.cache_ttl is not None:
+            ids = list(ids)
+            after_commit(self.session, lambda: row_cache.invalidate(self.model, ids))
 
     async def get_all(
         self,
         limit: int = 25,
         offset: int = 0,
     ) -> Sequence[Row[Any]]:
-        query = select(self.model)
+        query = (
+            select(self.model)
+            .options(*self.list_options)
+            .order_by(self.model.created_at, self.model.id)
+        )
 
         query = query.limit(limit).offset(offset)
 
-        async with self.session as session:
-            try:
-                result = await session.execute(query)
-            except SQLAlchemyError as e:
-                logger.error(f"Error executing query: {e}")
-                return []
-
-            instances = result.scalars().all()
+        try:
+            instances = await self._read(query, lambda result: result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error(f"Error executing query: {e}")
+            return []
         return instances
 
+    async def get_all_by_cursor(
+        self,
+        limit: int = 25,
+        cursor: str | None = None,
+    ) -> Tuple[Sequence[Row[Any]], str | None]:
+        # keyset pagination: seek past the last (created_at, id) seen instead of
+        # scanning and discarding every earlier row like OFFSET does
+        query = (
+            select(self.model)
+            .options(*self.list_options)
+            .order_by(self.model.created_at, self.model.id)
+        )
+
+        if cursor:
+            created_at, id_ = decode_cursor(cursor)
+            query = query.where(
+                tuple_(self.model.created_at, self.model.id) > tuple_(created_at, id_)
+            )
+
+        query = query.limit(limit)
+
+        try:
+            instances = await self._read(query, lambda result: result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error(f"Error executing query: {e}")
+            return [], None
+        return instances, get_next_cursor(instances, limit)
+
+    def get_export_columns(self) -> tuple:
+        return self.export_columns or tuple(self.model.__table__.columns)
+
+    async def stream_all(self) -> AsyncIterator[Sequence[Row[Any]]]:
+        # plain column rows from a server-side cursor, export_batch_size at a
+        # time; runs on a session of its own because the request session is
+        # closed before a streaming response body is sent
+        query = (
+            select(*self.get_export_columns())
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=self.export_batch_size)
+        )
+        replica = replica_router.choose()
+        bind = replica.engine if replica is not None else self.session.bind
+        async with AsyncSession(bind) as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                yield rows
+
     async def get_all_paginated(
         self,
         page: int = 1,
         page_size: int = 25,
-    ) -> Tuple[int, Sequence[Row[Any]]]:
+    ) -> Tuple[TotalCount, Sequence[Row[Any]]]:
         limit = page_size
         offset = (page - 1) * page_size
 
@@ -97,21 +419,80 @@ class AbstractBaseService(ABC, Generic[T]):
             limit=limit,
             offset=offset,
         )
-        count = await self.get_count()
+        count = await self.get_total_count()
         return count, instances
 
+    async def get_total_count(
+        self,
+        strategy: CountStrategy | None = None,
+    ) -> TotalCount:
+        strategy = strategy or self.count_strategy
+        table_name = self.model.__tablename__
+
+        if strategy is CountStrategy.CACHED:
+            count = count_cache.get(table_name)
+            if count is None:
+                count = await self.get_count()
+                count_cache.set(table_name, count, self.count_cache_ttl)
+            return TotalCount(count, strategy)
+
+        count = None
+        if strategy is CountStrategy.COUNTER:
+            count = await self._get_scalar(
+                select(table_row_counts.c.row_count).where(
+                    table_row_counts.c.table_name == table_name
+                )
+            )
+        elif (
+            strategy is CountStrategy.ESTIMATED
+            and self.session.bind.dialect.name == "postgresql"
+        ):
+            # other backends fall through to an exact count
+            count = await self._get_scalar(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:table_name)"
+                ).bindparams(table_name=table_name)
+            )
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if count is not None and count >= 0:
+            return TotalCount(count, strategy)
+
+        return TotalCount(await self.get_count(), CountStrategy.EXACT)
+
+    @coalesce
     async def get_count(
         self,
     ) -> int:
         query = select(func.count()).select_from(self.model)
 
         # get count
-        async with self.session as session:
+        try:
+            count = await self._read(query, lambda result: result.scalar())
+        except SQLAlchemyError as e:
+            logger.error(f"Error executing query: {e}")
+            return 0
+        return count
+
+    async def _get_scalar(self, query) -> Any:
+        try:
+            return await self._read(query, lambda result: result.scalar())
+        except SQLAlchemyError as e:
+            logger.error(f"Error executing query: {e}")
+            return None
+
+    async def _read(self, query, consume: Callable[[Result], Any]) -> Any:
+        # read-only queries go to a replica when one is configured and healthy;
+        # the result is consumed while its session is still open
+        replica = replica_router.choose()
+        if replica is not None:
             try:
-                result = await session.execute(query)
-            except SQLAlchemyError as e:
-                logger.error(f"Error executing query: {e}")
-                return 0
+                async with replica.session_maker() as session:
+                    return consume(await session.execute(query))
+            except (SQLAlchemyError, OSError) as e:
+                if not is_disconnect(e):
+                    raise
+                logger.error(f"Ejecting unreachable read replica: {e}")
+                replica_router.eject(replica)
 
-            count = result.scalar()
-        return count
+        return consume(await self.session.execute(query))
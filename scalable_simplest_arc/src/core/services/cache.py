@@ -0,0 +1,205 @@
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable
+
+import orjson
+from sqlalchemy import Enum, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.core.config import settings
+from src.logger import logger
+from src.utils.cache import TTLCache
+
+# cached value for an id that was looked up and not found
+MISSING = b"null"
+
+
+@dataclass
+class RowCacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+
+class MemoryBackend:
+    """Per-process backend, for tests and single-worker setups."""
+
+    errors: tuple[type[Exception], ...] = ()
+
+    def __init__(self, maxsize: int = 10_000):
+        self._cache = TTLCache(maxsize=maxsize)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    async def close(self) -> None:
+        self._cache.clear()
+
+
+class RedisBackend:
+    def __init__(self, url: str, timeout: float):
+        # imported here so workers running without Redis skip the client
+        from redis import asyncio as aioredis
+        from redis.exceptions import RedisError
+
+        # redis' TimeoutError is a RedisError and the builtin one an OSError,
+        # so a timed-out call is logged and read as a miss like any failure
+        self.errors = (RedisError, TimeoutError)
+        self._redis = aioredis.from_url(
+            url, socket_connect_timeout=timeout, socket_timeout=timeout
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        await self._redis.delete(*keys)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+@lru_cache
+def _columns(model) -> tuple[tuple[str, Any], ...]:
+    # (attribute, decoder) for every mapped column, in mapper order
+    columns = []
+    for attr in inspect(model).column_attrs:
+        column_type = attr.columns[0].type
+        decode = None
+        if isinstance(column_type, Enum) and column_type.enum_class is not None:
+            decode = column_type.enum_class
+        elif getattr(column_type, "python_type", None) is datetime:
+            decode = datetime.fromisoformat
+        columns.append((attr.key, decode))
+    return tuple(columns)
+
+
+def encode_row(instance, exclude: Iterable[str] = ()) -> bytes:
+    return orjson.dumps(
+        {
+            key: getattr(instance, key)
+            for key, _ in _columns(type(instance))
+            if key not in exclude
+        }
+    )
+
+
+def decode_row(model, data: bytes):
+    values = orjson.loads(data)
+    kwargs = {}
+    for key, decode in _columns(model):
+        if key not in values:
+            continue
+        value = values[key]
+        kwargs[key] = decode(value) if decode and value is not None else value
+    instance = model(**kwargs)
+    # detached and persistent-looking: columns left out of the cache entry are
+    # unloaded and raise on access instead of silently reading None
+    make_transient_to_detached(instance)
+    return instance
+
+
+def detached_copy(instance):
+    # a new detached instance with the loaded columns of one that belongs to
+    # another session; relationships are left unloaded, as in decode_row
+    state = inspect(instance)
+    instance = type(instance)(
+        **{
+            key: state.dict[key]
+            for key, _ in _columns(type(instance))
+            if key in state.dict
+        }
+    )
+    make_transient_to_detached(instance)
+    return instance
+
+
+class RowCache:
+    """Cache-aside store for single rows keyed by model and primary key.
+
+    Backend failures are logged and treated as misses, so an unreachable cache
+    degrades to plain database reads.
+    """
+
+    def __init__(self, backend, prefix: str = "row"):
+        self.backend = backend
+        self.prefix = prefix
+        self.stats: dict[str, RowCacheStats] = defaultdict(RowCacheStats)
+        self._errors = (*getattr(backend, "errors", ()), OSError)
+
+    def _key(self, model, id_: int) -> str:
+        return f"{self.prefix}:{model.__tablename__}:{id_}"
+
+    async def get(self, model, id_: int) -> tuple[bool, Any]:
+        """Return ``(hit, instance)``; a hit with ``None`` is a cached miss."""
+        if self.backend is None:
+            return False, None
+        stats = self.stats[model.__tablename__]
+        try:
+            data = await self.backend.get(self._key(model, id_))
+            if data is None:
+                stats.misses += 1
+                return False, None
+            if data == MISSING:
+                stats.negative_hits += 1
+                return True, None
+            instance = decode_row(model, data)
+        except (*self._errors, ValueError, TypeError) as e:
+            stats.errors += 1
+            logger.error(f"Row cache read failed: {e}")
+            return False, None
+        stats.hits += 1
+        return True, instance
+
+    async def set(
+        self, model, id_: int, instance, ttl: float, exclude: Iterable[str] = ()
+    ) -> None:
+        if self.backend is None:
+            return
+        data = MISSING if instance is None else encode_row(instance, exclude)
+        try:
+            await self.backend.set(self._key(model, id_), data, ttl)
+        except self._errors as e:
+            self.stats[model.__tablename__].errors += 1
+            logger.error(f"Row cache write failed: {e}")
+
+    async def invalidate(self, model, ids: Iterable[int]) -> None:
+        keys = [self._key(model, id_) for id_ in ids]
+        if self.backend is None or not keys:
+            return
+        try:
+            await self.backend.delete(*keys)
+        except self._errors as e:
+            self.stats[model.__tablename__].errors += 1
+            logger.error(f"Row cache invalidation failed: {e}")
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {table: asdict(stats) for table, stats in self.stats.items()}
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+
+def build_backend(name: str):
+    if name == "redis":
+        return RedisBackend(str(settings.redis_uri), settings.row_cache_timeout)
+    if name == "memory":
+        return MemoryBackend()
+    return None
+
+
+row_cache = RowCache(build_backend(settings.row_cache_backend))
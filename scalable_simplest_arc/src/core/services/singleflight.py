@@ -0,0 +1,96 @@
+import asyncio
+import functools
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from sqlalchemy import inspect
+
+from src.core.services.cache import detached_copy
+from src.db.replicas import is_stuck_to_primary
+
+R = TypeVar("R")
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight execution.
+
+    The first caller (the leader) runs the coroutine itself, so it keeps using
+    its own request's session; followers await a future with the outcome.
+    ORM instances in it stay attached to the leader's session, which may
+    expire or lazy-load them at any time, so followers get detached copies.
+    Cancelling a follower only detaches it. If the leader is cancelled, a
+    waiting follower takes over instead of failing with it.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        while (future := self._calls.get(key)) is not None:
+            self.stats.coalesced += 1
+            try:
+                return _for_follower(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.stats.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # mark it retrieved, there may be no followers to do so
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self.stats)
+
+
+def _for_follower(result: R) -> R:
+    if inspect(result, raiseerr=False) is None:
+        return result
+    return detached_copy(result)
+
+
+single_flight = SingleFlight()
+
+
+def coalesce(method: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """Coalesce concurrent identical calls of a read-only service method.
+
+    Calls are keyed on the service class, method and arguments. Requests that
+    have written are not coalesced: a read already in flight may have started
+    before their commit. Calls with unhashable arguments run uncoalesced too.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> R:
+        if is_stuck_to_primary():
+            return await method(self, *args, **kwargs)
+        key = (type(self), method.__name__, args, frozenset(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return await method(self, *args, **kwargs)
+        return await single_flight.do(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
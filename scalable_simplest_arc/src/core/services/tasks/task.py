@@ -1,12 +1,45 @@
+from typing import Any, Sequence, Tuple
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
 
+from src.core.paginate import CountStrategy
 from src.core.services.base import AbstractBaseService, T
 from src.db import get_async_session
 from src.db.models.tasks import Task
+from src.db.models.users import User
 
 
 class TaskService(AbstractBaseService[Task]):
+    count_strategy = CountStrategy.COUNTER
+    # TaskListSchema plus the keyset and ETag columns; a single-table query
+    list_options = (
+        load_only(
+            Task.id,
+            Task.created_at,
+            Task.updated_at,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.assignee_id,
+            raiseload=True,
+        ),
+    )
+    cache_ttl = 60.0
+    export_columns = (
+        Task.id,
+        Task.title,
+        Task.description,
+        Task.status,
+        Task.created_by_id,
+        Task.assignee_id,
+        Task.created_at,
+        Task.updated_at,
+        Task.is_active,
+    )
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, Task)
 
@@ -14,6 +47,36 @@ class TaskService(AbstractBaseService[Task]):
         kwargs["created_by_id"] = user.id
         return await super().create(**kwargs)
 
+    async def bulk_create(
+        self, user, items: Sequence[dict[str, Any]]
+    ) -> Tuple[list[Task], dict[int, str]]:
+        for item in items:
+            item["created_by_id"] = user.id
+        return await super().bulk_create(items)
+
+    async def bulk_import(
+        self, user, items: Sequence[dict[str, Any]]
+    ) -> Tuple[int, dict[int, str]]:
+        for item in items:
+            item["created_by_id"] = user.id
+        return await super().bulk_import(items)
+
+    async def validate_bulk(self, items: Sequence[dict[str, Any]]) -> dict[int, str]:
+        # one lookup per chunk instead of letting a single bad assignee fail
+        # the whole INSERT on its foreign key
+        assignee_ids = {item.get("assignee_id") for item in items} - {None}
+        if not assignee_ids:
+            return {}
+        result = await self.session.scalars(
+            select(User.id).where(User.id.in_(assignee_ids))
+        )
+        existing = set(result.all()) | {None}
+        return {
+            i: "Assignee does not exist"
+            for i, item in enumerate(items)
+            if item.get("assignee_id") not in existing
+        }
+
 
 def get_task_service(session: AsyncSession = Depends(get_async_session)):
     return TaskService(session)
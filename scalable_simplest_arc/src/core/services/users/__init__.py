@@ -1,6 +1,8 @@
 from src.core.services.users.auth import (
     create_access_token,
     get_current_active_user,
+    get_current_admin_user,
     get_current_user,
 )
+from src.core.services.users.password import PasswordHasherBusyError, password_hasher
 from src.core.services.users.user import get_user_service
@@ -3,17 +3,20 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 
 from src.core.config import settings
-from src.core.schemas.users.auth import TokenData
+from src.core.schemas.users.auth import TokenData, UserPrincipalSchema
+from src.core.services.users.cache import principal_cache
 from src.core.services.users.user import get_user_service
-from src.db.models.users import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
+    # jose (and its crypto backends) load on the first login or token check
+    # rather than at worker boot
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -30,6 +33,14 @@ async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     user_service=Depends(get_user_service),
 ):
+    # a cached principal means this exact token was already verified, so the
+    # signature check and the user lookup can both be skipped
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,12 +61,24 @@ async def get_current_user(
     user = await user_service.get_by_username(token_data.username)
     if user is None:
         raise credentials_exception
-    return user
+    principal = UserPrincipalSchema.model_validate(user)
+    principal_cache.set(token, payload, principal)
+    return principal
 
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipalSchema, Depends(get_current_user)],
 ):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_admin_user(
+    current_user: Annotated[UserPrincipalSchema, Depends(get_current_active_user)],
+):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+        )
+    return current_user
@@ -0,0 +1,46 @@
+import hashlib
+import time
+from typing import Any
+
+from src.core.config import settings
+from src.core.schemas.users.auth import UserPrincipalSchema
+from src.utils.cache import TTLCache
+
+
+class PrincipalCache:
+    """Verified JWT claims and user snapshot, keyed by a hash of the token."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> UserPrincipalSchema | None:
+        entry = self._cache.get(self._key(token))
+        if entry is None:
+            return None
+        _claims, principal = entry
+        return principal
+
+    def set(
+        self, token: str, claims: dict[str, Any], principal: UserPrincipalSchema
+    ) -> None:
+        exp = claims.get("exp")
+        if exp is None:
+            return
+        ttl = min(self._cache.ttl, exp - time.time())
+        if ttl > 0:
+            self._cache.set(self._key(token), (claims, principal), ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._cache.delete_where(lambda _key, entry: entry[1].id == user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.auth_cache_size, ttl=settings.auth_cache_ttl
+)
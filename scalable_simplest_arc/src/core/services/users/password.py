@@ -0,0 +1,106 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+
+from src.core.config import settings
+from src.utils.passwords import hash_password, verify_password
+
+
+class PasswordHasherBusyError(Exception):
+    pass
+
+
+@dataclass
+class PasswordHasherStats:
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    restarts: int = 0
+    total_seconds: float = 0.0
+
+
+class PasswordHasher:
+    """Async facade over a bounded process pool running pbkdf2."""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.stats = PasswordHasherStats()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self._executor is None:
+            # spawn, not fork: the parent has an event loop and driver threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        # concurrent callers all see the same broken executor; only the first
+        # replaces it
+        if self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.start()
+            self.stats.restarts += 1
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.stats.in_flight - self.max_workers, 0)
+
+    def snapshot(self) -> dict:
+        return {**asdict(self.stats), "queue_depth": self.queue_depth}
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(verify_password, password, hashed)
+
+    async def _run(self, fn, *args):
+        if self.stats.in_flight >= self.max_pending:
+            self.stats.rejected += 1
+            raise PasswordHasherBusyError("Too many password operations in progress")
+        self.start()
+        self.stats.in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+        started = time.perf_counter()
+        try:
+            result = await self._submit(fn, *args)
+        except BaseException:
+            self.stats.failed += 1
+            raise
+        else:
+            self.stats.completed += 1
+            return result
+        finally:
+            self.stats.in_flight -= 1
+            self.stats.total_seconds += time.perf_counter() - started
+
+    async def _submit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # a worker died (OOM kill, segfault) and took the executor with
+            # it; every later call would fail too, so replace it and retry once
+            self._restart(executor)
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
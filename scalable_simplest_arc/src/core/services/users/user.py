@@ -1,28 +1,61 @@
 from fastapi import Depends
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
 
+from src.core.paginate import CountStrategy
 from src.core.services.base import AbstractBaseService
-from src.db import get_async_session
+from src.core.services.users.cache import principal_cache
+from src.core.services.users.password import password_hasher
+from src.db import after_commit, get_async_session, release_connection
 from src.db.models.users import User
 
 
 class UserService(AbstractBaseService[User]):
+    count_strategy = CountStrategy.COUNTER
+    # UserListSchema plus the keyset and ETag columns; never ships password
+    # hashes
+    list_options = (
+        load_only(
+            User.id,
+            User.created_at,
+            User.updated_at,
+            User.username,
+            User.first_name,
+            User.last_name,
+            raiseload=True,
+        ),
+    )
+    cache_ttl = 60.0
+    # keep password hashes out of the shared cache
+    cache_exclude = ("password",)
+    export_columns = (
+        User.id,
+        User.username,
+        User.first_name,
+        User.last_name,
+        User.created_at,
+        User.updated_at,
+        User.is_active,
+    )
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, User)
 
     async def get_by_username(self, username: str) -> User:
-        async with self.session:
-            query = select(self.model).where(self.model.username.icontains(username))
-            result = await self.session.execute(query)
-            instance = result.scalars().first()
-            return instance
+        # matches ix_users_username_lower, so this is a unique index lookup
+        query = select(self.model).where(
+            func.lower(self.model.username) == username.lower()
+        )
+        return await self._read(query, lambda result: result.scalars().first())
 
     async def authenticate_user(self, username: str, password: str) -> User:
         user = await self.get_by_username(username)
         if not user:
             raise ValueError("User not found")
-        if not user.verify_password(password):
+        await release_connection(self.session)
+        if not await password_hasher.verify(password, user.password):
             raise ValueError("Invalid password")
         return user
 
@@ -32,34 +65,36 @@ class UserService(AbstractBaseService[User]):
         if user:
             raise ValueError("Username already exists")
 
-        password = kwargs.pop("password")
-
-        instance = self.model(**kwargs)
-        instance.set_password(password)
-        self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
-        return instance
+        await release_connection(self.session)
+        kwargs["password"] = await password_hasher.hash(kwargs["password"])
+        return await super().create(**kwargs)
 
     async def update(self, id_: int, **kwargs) -> User:
         username = kwargs.get("username")
         user = await self.get_by_username(username)
         if user and user.id != id_:
             raise ValueError("Email already exists")
-        return await super().get_and_update(id_, **kwargs)
+        instance = await super().update(id_, **kwargs)
+        after_commit(self.session, lambda: principal_cache.invalidate_user(id_))
+        return instance
+
+    async def delete(self, id_: int) -> None:
+        await super().delete(id_)
+        after_commit(self.session, lambda: principal_cache.invalidate_user(id_))
 
     async def update_password(
         self, id_: int, old_password: str, new_password: str
     ) -> User:
-        user = await self.get_by_id(id_)
+        user = await self.get_by_id(id_, cached=False)
         if not user:
             raise ValueError("User not found")
-        if not user.verify_password(old_password):
+        await release_connection(self.session)
+        if not await password_hasher.verify(old_password, user.password):
             raise ValueError("Invalid password")
-        user.set_password(new_password)
-        self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        user = await super().update(
+            id_, password=await password_hasher.hash(new_password)
+        )
+        after_commit(self.session, lambda: principal_cache.invalidate_user(id_))
         return user
 
 
@@ -1 +1,8 @@
-from .db import AbstractModel, async_session_maker, get_async_session
+from .db import (
+    AbstractModel,
+    after_commit,
+    async_session_maker,
+    commit,
+    get_async_session,
+    release_connection,
+)
@@ -1,12 +1,105 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import inspect
+from typing import Any, Callable
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
 
 from src.core.config import settings
 from src.db.models.base import AbstractModel  # noqa
+from src.db.pool import InstrumentedQueuePool
+from src.db.replicas import ReplicaRouter, is_stuck_to_primary
+from src.db.sqlite import create_engines as create_sqlite_engines
+
+
+def engine_options() -> dict:
+    if settings.db_pgbouncer:
+        # pgbouncer owns pooling, and a server-side prepared statement may
+        # land on a different backend on the next transaction
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    pool_size, max_overflow = settings.db_pool_limits()
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    }
 
-engine = create_async_engine(str(settings.postgres_uri))
+
+if settings.database_backend == "sqlite":
+    engine, replica_engines = create_sqlite_engines()
+else:
+    engine = create_async_engine(settings.database_uri, **engine_options())
+    replica_engines = [
+        create_async_engine(str(uri), **engine_options())
+        for uri in settings.postgres_replica_uris
+    ]
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+replica_router = ReplicaRouter(
+    replica_engines, ejection_seconds=settings.db_replica_ejection_seconds
+)
+
+
+def named_engines() -> list[tuple[str, AsyncEngine]]:
+    # the names the admin pool route and the pool metrics report
+    return [
+        ("primary", engine),
+        *(
+            (f"replica-{i}", replica.engine)
+            for i, replica in enumerate(replica_router.replicas)
+        ),
+    ]
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    # e.g. cache invalidation, which must not run before the write is visible
+    # to other connections or at all when the transaction rolls back
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+async def commit(session: AsyncSession) -> None:
+    await session.commit()
+    for callback in session.info.pop("after_commit", []):
+        result = callback()
+        if inspect.isawaitable(result):
+            await result
+
+
+async def release_connection(session: AsyncSession) -> None:
+    # ends a read-only transaction so its pooled connection is not held idle
+    # across slow work that needs no database, e.g. password hashing; a
+    # request that has written keeps its transaction until it commits
+    if session.in_transaction() and not is_stuck_to_primary():
+        await session.commit()
 
 
 async def get_async_session():
+    # request-scoped unit of work: every service of a request shares this
+    # session, which checks out a connection on first use; the transaction
+    # commits when the endpoint returns and rolls back when it raises
     async with async_session_maker() as session:
-        yield session
+        try:
+            yield session
+        except Exception:
+            session.info.pop("after_commit", None)
+            await session.rollback()
+            raise
+        await commit(session)
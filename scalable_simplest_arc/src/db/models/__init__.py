@@ -1,2 +1,3 @@
+from .counters import *
 from .tasks import *
 from .users import *
@@ -0,0 +1 @@
+from src.db.models.counters.counter import table_row_counts
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, String, Table
+
+from src.db.models.base import AbstractModel
+
+# one row per counted table, kept exact by the triggers created in the
+# "table row counters" migration
+table_row_counts = Table(
+    "table_row_counts",
+    AbstractModel.metadata,
+    Column("table_name", String(63), primary_key=True),
+    Column("row_count", BigInteger, nullable=False, default=0),
+)
+
+
+__all__ = ("table_row_counts",)
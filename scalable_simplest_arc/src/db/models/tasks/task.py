@@ -1,7 +1,7 @@
 import enum
 
-from sqlalchemy import Enum, ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Enum, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 
 from src.db.models.base import AbstractModel
 
@@ -14,6 +14,17 @@ class TaskStatus(enum.Enum):
 
 class Task(AbstractModel):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_created_by_id_created_at", "created_by_id", "created_at"),
+        Index(
+            "ix_tasks_assignee_id_status_created_at",
+            "assignee_id",
+            "status",
+            "created_at",
+        ),
+        Index("ix_tasks_status_created_at", "status", "created_at"),
+    )
 
     title: Mapped[str] = mapped_column(String(50), nullable=False)
     description: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -22,11 +33,19 @@ class Task(AbstractModel):
     created_by_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     assignee_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=True)
 
+    # raiseload by default: a read that needs the users has to ask for them
+    # with selectinload/joinedload instead of every select(Task) joining twice
     created_by: Mapped["User"] = relationship(
-        "User", foreign_keys=[created_by_id], backref="created_tasks", lazy="joined"
+        "User",
+        foreign_keys=[created_by_id],
+        backref=backref("created_tasks", lazy="raise"),
+        lazy="raise",
     )
     assignee: Mapped["User"] = relationship(
-        "User", foreign_keys=[assignee_id], backref="assigned_tasks", lazy="joined"
+        "User",
+        foreign_keys=[assignee_id],
+        backref=backref("assigned_tasks", lazy="raise"),
+        lazy="raise",
     )
 
 
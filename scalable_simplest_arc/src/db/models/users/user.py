@@ -1,23 +1,31 @@
-from passlib.hash import pbkdf2_sha256 as sha256
-from sqlalchemy import String
+from sqlalchemy import Index, String, false, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.models.base import AbstractModel
+from src.utils import passwords
 
 
 class User(AbstractModel):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_username_lower", text("lower(username)"), unique=True),
+    )
 
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     password: Mapped[str] = mapped_column(nullable=False)
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
     last_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    # granted in the database only; no API schema accepts it
+    is_admin: Mapped[bool] = mapped_column(default=False, server_default=false())
 
+    # synchronous helpers; request handlers go through the async
+    # password_hasher so pbkdf2 never runs on the event loop
     def set_password(self, password):
-        self.password = sha256.using().hash(password)
+        self.password = passwords.hash_password(password)
 
     def verify_password(self, password):
-        return sha256.verify(password, self.password)
+        return passwords.verify_password(password, self.password)
 
 
 __all__ = ("User",)
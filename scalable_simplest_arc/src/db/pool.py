@@ -0,0 +1,54 @@
+import time
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def observe(self, waited: float, checked_out: bool, timed_out: bool) -> None:
+        self.checkouts += checked_out
+        self.timeouts += timed_out
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        # wait time covers queueing for a free connection and, when the pool
+        # has to grow into its overflow, opening the new connection
+        started = time.perf_counter()
+        checked_out = timed_out = False
+        try:
+            connection = super()._do_get()
+            checked_out = True
+            return connection
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.stats.observe(time.perf_counter() - started, checked_out, timed_out)
+
+
+def pool_status(name: str, pool: Pool) -> dict:
+    status = {"engine": name, "pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+    # uninstrumented pools (NullPool behind pgbouncer) report zeros
+    return {**status, **asdict(getattr(pool, "stats", PoolStats()))}
@@ -0,0 +1,99 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.logger import logger
+
+# slow query entries are cut off here; a bulk insert can carry megabytes
+MAX_LOGGED_PARAMETERS = 2000
+
+
+@dataclass
+class RequestDBStats:
+    queries: int = 0
+    seconds: float = 0.0
+    # executions per statement text, kept only while profiling
+    statements: Counter | None = None
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        if not self.statements:
+            return []
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+# set per request by track_queries(); engine events add to it
+request_db_stats: ContextVar[RequestDBStats | None] = ContextVar(
+    "request_db_stats", default=None
+)
+
+# called with the duration of every statement, e.g. a latency histogram
+query_observers: list[Callable[[float], None]] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._profiler_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._profiler_started
+    for observe in query_observers:
+        observe(elapsed)
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements[statement] += 1
+    threshold = settings.db_slow_query_ms
+    if threshold and elapsed * 1000 >= threshold:
+        # bind parameters can hold personal data and password hashes; the
+        # threshold is off unless set
+        logger.warning(
+            "Slow query",
+            duration_ms=round(elapsed * 1000, 3),
+            sql=statement,
+            parameters=repr(parameters)[:MAX_LOGGED_PARAMETERS],
+            executemany=executemany,
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    # cursor events fire inside SQLAlchemy's greenlet, which shares the
+    # request task's context, so request_db_stats is visible here
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(profile: bool = False) -> Iterator[RequestDBStats]:
+    """Collect the statements run in this context, usually one request.
+
+    Nested calls share the outer stats object, so the metrics and profiler
+    middlewares see the same counts whichever order they are installed in.
+    """
+    stats = request_db_stats.get()
+    if stats is not None:
+        if profile and stats.statements is None:
+            stats.statements = Counter()
+        yield stats
+        return
+    stats = RequestDBStats(statements=Counter() if profile else None)
+    token = request_db_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        request_db_stats.reset(token)
@@ -0,0 +1,68 @@
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+# set once the current request has written, so its later reads see the write
+# instead of a replica that may still be catching up
+_use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+
+def stick_to_primary() -> None:
+    _use_primary.set(True)
+
+
+def is_stuck_to_primary() -> bool:
+    return _use_primary.get()
+
+
+@contextmanager
+def read_from_primary():
+    token = _use_primary.set(True)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+def is_disconnect(error: Exception) -> bool:
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(
+            error, (OperationalError, InterfaceError)
+        )
+    return isinstance(error, OSError)
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        self.ejected_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas; failing ones sit out for a while."""
+
+    def __init__(self, engines: list[AsyncEngine], ejection_seconds: float):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.ejection_seconds = ejection_seconds
+        self._counter = itertools.count()
+
+    def choose(self) -> Replica | None:
+        if not self.replicas or is_stuck_to_primary():
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._counter) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def eject(self, replica: Replica) -> None:
+        replica.ejected_until = time.monotonic() + self.ejection_seconds
@@ -0,0 +1,69 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.core.config import settings
+from src.db.pool import InstrumentedQueuePool
+
+PRAGMAS = (
+    # readers never block the writer and see the last committed state
+    ("journal_mode", "WAL"),
+    # WAL stays consistent after a crash; only the last commits can be lost
+    ("synchronous", "NORMAL"),
+    ("foreign_keys", "ON"),
+    ("temp_store", "MEMORY"),
+    # negative means KiB
+    ("cache_size", "-65536"),
+    ("mmap_size", str(256 * 1024 * 1024)),
+)
+
+
+def _configure(engine: AsyncEngine, read_only: bool) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        # let SQLAlchemy emit BEGIN instead of the driver, which otherwise
+        # starts transactions late and breaks SAVEPOINT
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {settings.sqlite_busy_timeout_ms}")
+        for name, value in PRAGMAS:
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def on_begin(connection):
+        # the writer takes the lock up front: a deferred transaction that
+        # reads first fails with SQLITE_BUSY on its first write instead of
+        # waiting for the busy timeout; issued on the DBAPI cursor so it is
+        # not counted as a query by the profiler
+        cursor = connection.connection.cursor()
+        cursor.execute("BEGIN" if read_only else "BEGIN IMMEDIATE")
+        cursor.close()
+
+
+def create_engines() -> tuple[AsyncEngine, list[AsyncEngine]]:
+    """The write engine and a read-only engine on the same file.
+
+    SQLite allows a single writer, so the write engine holds one connection
+    and concurrent units of work queue on the pool rather than on the file
+    lock. The read engine is registered as a replica: the services' read-only
+    queries use it and run in parallel with the writer under WAL.
+    """
+    writer = create_async_engine(
+        settings.database_uri,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    reader = create_async_engine(
+        settings.database_uri,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.sqlite_readers,
+        max_overflow=0,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    _configure(writer, read_only=False)
+    _configure(reader, read_only=True)
+    return writer, [reader]
@@ -1,19 +1,200 @@
 import logging
+import queue
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
+import orjson
+
+from src.core.config import settings
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# third-party loggers that install their own blocking handlers
+ROUTED_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access", "gunicorn.error")
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of the records below WARNING, per logger name."""
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.name, 1.0)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per call site for WARNING and above, so one failing hot
+    path cannot flood the log; lower levels are left to sampling.
+
+    The next record let through from a throttled call site carries the number
+    of records suppressed in between.
+    """
+
+    def __init__(self, per_second: float, burst: int):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst
+        self.rate_limited = 0
+        self._buckets: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.per_second <= 0 or record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            # [tokens, last refill, suppressed since last emit]
+            bucket = self._buckets.setdefault(key, [self.burst, now, 0])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                self.rate_limited += 1
+                return False
+            bucket[0] -= 1
+            record.suppressed, bucket[2] = bucket[2], 0
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "location": f"{record.module}:{record.lineno}",
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Never blocks the caller: records that do not fit in the queue are dropped."""
+
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # only merge the arguments here; formatting, tracebacks included,
+        # happens on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingPipeline:
+    """Moves all log I/O off the event loop onto a QueueListener thread."""
 
-class Logger:
     def __init__(self):
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        self.handler: BoundedQueueHandler | None = None
+        self.listener: QueueListener | None = None
+        self.sampling = SamplingFilter(settings.log_sample_rates)
+        self.rate_limit = RateLimitFilter(
+            settings.log_rate_limit_per_second, settings.log_rate_limit_burst
+        )
+        self._routed: dict[str, tuple[list, bool]] = {}
+
+    def start(self) -> None:
+        if self.listener is not None:
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(
+            JSONFormatter()
+            if settings.log_json
+            else logging.Formatter(
+                "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+            )
+        )
+        self.handler = BoundedQueueHandler(settings.log_queue_size)
+        for filter_ in (RequestIdFilter(), self.sampling, self.rate_limit):
+            self.handler.addFilter(filter_)
+        self.listener = QueueListener(self.handler.queue, output)
+
+        root = logging.getLogger()
+        root.handlers = [self.handler]
+        root.setLevel(settings.log_level)
+        for name in ROUTED_LOGGERS:
+            routed = logging.getLogger(name)
+            self._routed[name] = (routed.handlers, routed.propagate)
+            routed.handlers, routed.propagate = [], True
+        self.listener.start()
+
+    def stop(self) -> None:
+        if self.listener is None:
+            return
+        # drains what is already queued before returning
+        self.listener.stop()
+        logging.getLogger().removeHandler(self.handler)
+        for name, (handlers, propagate) in self._routed.items():
+            routed = logging.getLogger(name)
+            routed.handlers, routed.propagate = handlers, propagate
+        self._routed.clear()
+        self.listener = None
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "queued": self.handler.queue.qsize() if self.handler else 0,
+            "dropped": self.handler.dropped if self.handler else 0,
+            "sampled_out": self.sampling.sampled_out,
+            "rate_limited": self.rate_limit.rate_limited,
+        }
+
+
+class Logger:
+    def __init__(self, name: str = __name__):
+        # until the pipeline starts (scripts, migrations) records go to stderr
+        logging.basicConfig(level=settings.log_level)
+        self.logger = logging.getLogger(name)
+
+    # stacklevel=2 attributes records to the caller, which is also what the
+    # rate limit keys on
+
+    def info(self, message, **fields):
+        self.logger.info(message, extra={"fields": fields}, stacklevel=2)
 
-    def info(self, message):
-        self.logger.info(message)
+    def warning(self, message, **fields):
+        self.logger.warning(message, extra={"fields": fields}, stacklevel=2)
 
-    def error(self, message):
-        self.logger.error(message)
+    def error(self, message, **fields):
+        self.logger.error(message, extra={"fields": fields}, stacklevel=2)
 
-    def debug(self, message):
-        self.logger.debug(message)
+    def debug(self, message, **fields):
+        self.logger.debug(message, extra={"fields": fields}, stacklevel=2)
 
 
+logging_pipeline = LoggingPipeline()
 logger = Logger()
@@ -1,17 +1,63 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from src.api import root_router
 from src.core import settings
+from src.core.metrics import Monitor, render_metrics
+from src.core.middleware import (
+    DB_QUERY_COUNT_HEADER,
+    DB_TIME_HEADER,
+    REQUEST_ID_HEADER,
+    DBProfilerMiddleware,
+    MetricsMiddleware,
+    RequestIdMiddleware,
+)
+from src.core.openapi import OpenAPIDocument
+from src.core.services.cache import row_cache
+from src.core.services.users import PasswordHasherBusyError, password_hasher
+from src.db.db import named_engines
+from src.db.profiler import instrument_engine
 from src.dependencies import init_dependencies
+from src.logger import logging_pipeline
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     # you can do some initialization here
-    yield
+    logging_pipeline.start()
+    password_hasher.start()
+    monitor = None
+    if settings.metrics_enabled:
+        monitor = asyncio.create_task(
+            Monitor(
+                named_engines(),
+                settings.metrics_sample_interval,
+                password_hasher.snapshot,
+            ).run()
+        )
+    try:
+        yield
+    finally:
+        if monitor is not None:
+            monitor.cancel()
+            with suppress(asyncio.CancelledError):
+                await monitor
+        password_hasher.shutdown()
+        await row_cache.close()
+        # pooled aiosqlite connections each hold a thread that would keep the
+        # process alive
+        for _, disposable in named_engines():
+            await disposable.dispose()
+        logging_pipeline.stop()
 
 
 def init_routers(_app: FastAPI):
@@ -23,10 +69,54 @@ app = FastAPI(
     description=settings.app_description,
     version=settings.app_version,
     lifespan=lifespan,
+    default_response_class=(
+        ORJSONResponse if settings.fast_responses else JSONResponse
+    ),
+    # served below from a precomputed document instead
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
 )
 app.include_router(root_router)
 init_dependencies(app)
 
+OPENAPI_URL = "/openapi.json"
+openapi_document = OpenAPIDocument(app, settings.openapi_file)
+
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi(request: Request):
+    return openapi_document.response(request)
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui():
+    return get_swagger_ui_html(
+        openapi_url=OPENAPI_URL,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc():
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(_request: Request, exc: PasswordHasherBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 origins = ["*"]
 
 app.add_middleware(
@@ -35,4 +125,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        REQUEST_ID_HEADER,
+        DB_QUERY_COUNT_HEADER,
+        DB_TIME_HEADER,
+        "ETag",
+        # pagination state of the list routes
+        "X-Next-Cursor",
+        "X-Total-Count",
+        "X-Total-Count-Strategy",
+    ],
 )
+app.add_middleware(RequestIdMiddleware)
+
+if settings.metrics_enabled or settings.db_profiling or settings.db_slow_query_ms:
+    for _, instrumented in named_engines():
+        instrument_engine(instrumented)
+if settings.db_profiling:
+    app.add_middleware(DBProfilerMiddleware)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+    # sync on purpose: in multiprocess mode rendering reads every worker's
+    # files, which is better done on the threadpool than on the event loop
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        content, media_type = render_metrics()
+        return Response(content, media_type=media_type)
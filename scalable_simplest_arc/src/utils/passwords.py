@@ -0,0 +1,16 @@
+# kept free of application imports: these run inside the hashing worker
+# processes, which should not build settings or database engines; passlib
+# itself is imported on first use, since the web workers hand all hashing to
+# those processes and never need it
+
+
+def hash_password(password: str) -> str:
+    from passlib.hash import pbkdf2_sha256
+
+    return pbkdf2_sha256.using().hash(password)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    from passlib.hash import pbkdf2_sha256
+
+    return pbkdf2_sha256.verify(password, hashed)
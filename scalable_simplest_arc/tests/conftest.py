@@ -0,0 +1,92 @@
+import os
+import tempfile
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# the SQLite profile, so the suite needs neither Postgres nor Redis; set
+# before src is imported, the engines are built at import time
+os.environ.update(
+    DATABASE_BACKEND="sqlite",
+    SQLITE_PATH=str(Path(tempfile.mkdtemp()) / "test.db"),
+    ROW_CACHE_BACKEND="memory",
+    METRICS_ENABLED="false",
+)
+for key, value in {
+    "APP_TITLE": "test",
+    "APP_DESCRIPTION": "test",
+    "APP_VERSION": "test",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REDIS_URI": "redis://localhost:6379/0",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from alembic import command
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+
+    # no ini file: alembic's logging config would replace the app's
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+    command.upgrade(config, "head")
+
+    from src.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def _register(client, password: str = "test-password") -> dict:
+    username = f"user_{uuid4().hex[:12]}"
+    response = client.post(
+        "/api/v1/users",
+        json={
+            "username": username,
+            "password": password,
+            "first_name": "Test",
+            "last_name": "User",
+        },
+    )
+    assert response.status_code == 201, response.text
+    token = client.post(
+        "/api/v1/auth/token", data={"username": username, "password": password}
+    ).json()["access_token"]
+    return {
+        **response.json(),
+        "headers": {"Authorization": f"Bearer {token}"},
+    }
+
+
+@pytest.fixture
+def make_user(client):
+    return lambda: _register(client)
+
+
+@pytest.fixture
+def user(make_user) -> dict:
+    return make_user()
+
+
+@pytest.fixture
+def admin(client, make_user) -> dict:
+    import sqlite3
+
+    # granted by hand, as in production; before the token is first used, so
+    # the principal cache has nothing stale
+    admin = make_user()
+    with sqlite3.connect(os.environ["SQLITE_PATH"]) as connection:
+        connection.execute("UPDATE users SET is_admin = 1 WHERE id = ?", (admin["id"],))
+    return admin
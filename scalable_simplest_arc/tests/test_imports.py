@@ -0,0 +1,115 @@
+import pytest
+
+from src.core import imports
+from src.core.export import ExportFormat
+from src.core.imports import RecordError, batched, iter_records
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _collect(data: bytes, format_: ExportFormat, size: int) -> list:
+    return [record async for record in iter_records(_chunks(data, size), format_)]
+
+
+CSV = (
+    "\ufefftitle,description\n"
+    "plain,one line\n"
+    '"quoted, comma","two\nlines"\n'
+    "\n"
+    'caf\u00e9,"say ""hi"""\n'
+).encode()
+CSV_RECORDS = [
+    {"title": "plain", "description": "one line"},
+    {"title": "quoted, comma", "description": "two\nlines"},
+    {"title": "caf\u00e9", "description": 'say "hi"'},
+]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1024])
+async def test_csv_records_do_not_depend_on_chunk_boundaries(size):
+    # size 1 splits the BOM, "é" and every quoted newline across chunks
+    assert await _collect(CSV, ExportFormat.CSV, size) == CSV_RECORDS
+
+
+@pytest.mark.anyio
+async def test_csv_bad_row_is_reported_in_place():
+    data = b"title,description\nok,row\nonly one field\nalso,ok\n"
+
+    records = await _collect(data, ExportFormat.CSV, 5)
+
+    assert records[0] == {"title": "ok", "description": "row"}
+    assert isinstance(records[1], RecordError)
+    assert records[1] == "Expected 2 fields, got 1"
+    assert records[2] == {"title": "also", "description": "ok"}
+
+
+@pytest.mark.anyio
+async def test_csv_empty_field_is_none_and_last_line_needs_no_newline():
+    data = b"title,description\nno description,"
+
+    assert await _collect(data, ExportFormat.CSV, 4) == [
+        {"title": "no description", "description": None}
+    ]
+
+
+@pytest.mark.anyio
+async def test_csv_unterminated_quote_stops_at_the_size_limit(monkeypatch):
+    monkeypatch.setattr(imports, "MAX_RECORD_SIZE", 32)
+    data = b'title,description\nok,row\n"never closed,' + b"x\n" * 64
+
+    records = await _collect(data, ExportFormat.CSV, 8)
+
+    assert records[0] == {"title": "ok", "description": "row"}
+    assert records[1:] == ["Record too large or unterminated quote"]
+
+
+NDJSON = b'{"title": "a"}\n\n{"title": "\xc3\xa9"}\nnot json\n[1, 2]\n{"title": "last"}'
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size", [1, 4, 1024])
+async def test_ndjson_lines_span_chunks_and_bad_lines_are_errors(size):
+    records = await _collect(NDJSON, ExportFormat.NDJSON, size)
+
+    assert records[0] == {"title": "a"}
+    assert records[1] == {"title": "é"}
+    assert isinstance(records[2], RecordError)
+    assert records[2].startswith("Invalid JSON")
+    assert records[3] == "Expected a JSON object"
+    assert records[4] == {"title": "last"}
+    assert len(records) == 5
+
+
+@pytest.mark.anyio
+async def test_ndjson_oversized_line_stops_the_upload(monkeypatch):
+    monkeypatch.setattr(imports, "MAX_RECORD_SIZE", 16)
+    data = b'{"title": "a"}\n{"title": "' + b"x" * 64 + b'"}\n'
+
+    records = await _collect(data, ExportFormat.NDJSON, 8)
+
+    assert records == [{"title": "a"}, "Record too large"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "count, expected",
+    [
+        (0, []),
+        (4, [(0, 4)]),
+        (5, [(0, 4), (4, 1)]),
+        (8, [(0, 4), (4, 4)]),
+    ],
+)
+async def test_batched_positions(count, expected):
+    async def records():
+        for index in range(count):
+            yield index
+
+    batches = [batch async for batch in batched(records(), 4)]
+
+    assert [(start, len(batch)) for start, batch in batches] == expected
+    assert [record for _, batch in batches for record in batch] == list(range(count))
@@ -0,0 +1,48 @@
+from prometheus_client import REGISTRY
+
+from src.core.metrics import Monitor
+from src.core.services.users.password import PasswordHasher
+from src.db.db import named_engines
+
+
+def _value(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_monitor_exports_hasher_stats():
+    hasher = PasswordHasher(max_workers=2, max_pending=8)
+    monitor = Monitor(named_engines(), 1.0, hasher.snapshot)
+    before = _value("password_hash_operations_total", result="failed")
+
+    hasher.stats.in_flight = 5
+    hasher.stats.failed = 3
+    hasher.stats.rejected = 2
+    monitor.sample()
+
+    assert _value("password_hash_in_flight") == 5
+    assert _value("password_hash_queue_depth") == 3
+    assert _value("password_hash_operations_total", result="failed") == before + 3
+
+    # counters move by the delta between samples, not the running total
+    monitor.sample()
+    assert _value("password_hash_operations_total", result="failed") == before + 3
+
+
+def test_monitor_samples_every_engine(client):
+    # the SQLite profile has a writer and a reader registered as a replica
+    engines = named_engines()
+    assert [name for name, _ in engines] == ["primary", "replica-0"]
+    monitor = Monitor(engines, 1.0, PasswordHasher(1, 1).snapshot)
+    before = {
+        name: _value("db_pool_checkouts_total", engine=name) for name, _ in engines
+    }
+
+    client.get("/api/v1/users")
+    monitor.sample()
+
+    for name, engine in engines:
+        assert _value("db_pool_size", engine=name) == engine.pool.size()
+        assert (
+            _value("db_pool_checkouts_total", engine=name) - before[name]
+            == engine.pool.stats.checkouts
+        )
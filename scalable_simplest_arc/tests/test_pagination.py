@@ -0,0 +1,77 @@
+import base64
+import os
+import sqlite3
+
+import pytest
+
+from src.core.paginate import MAX_PAGE_SIZE
+
+
+@pytest.mark.parametrize("limit", [-1, 0, MAX_PAGE_SIZE + 1])
+def test_out_of_range_limit_is_rejected(client, user, limit):
+    for path in ("/api/v1/users", "/api/v1/tasks"):
+        response = client.get(path, params={"limit": limit}, headers=user["headers"])
+
+        assert response.status_code == 422, path
+
+
+def test_negative_offset_is_rejected(client):
+    assert client.get("/api/v1/users", params={"offset": -1}).status_code == 422
+
+
+def _exact_count(table: str) -> int:
+    with sqlite3.connect(os.environ["SQLITE_PATH"]) as connection:
+        return connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+def test_cursor_walk_matches_offset_order(client, make_user):
+    for _ in range(5):
+        make_user()
+    expected = [
+        row["id"]
+        for row in client.get("/api/v1/users", params={"limit": MAX_PAGE_SIZE}).json()
+    ]
+
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get("/api/v1/users", params=params)
+        assert response.status_code == 200
+        seen += [row["id"] for row in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+
+    assert seen == expected
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-a-cursor", base64.urlsafe_b64encode(b'["yesterday", 1]').decode()],
+)
+def test_bad_cursor_is_a_400(client, cursor):
+    response = client.get("/api/v1/users", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_counter_totals_follow_inserts_and_deletes(client, make_user):
+    def total(path: str, headers=None) -> int:
+        response = client.get(path, params={"with_count": True}, headers=headers)
+        assert response.headers["X-Total-Count-Strategy"] == "counter"
+        return int(response.headers["X-Total-Count"])
+
+    user = make_user()
+    assert total("/api/v1/users") == _exact_count("users")
+    for title in ("one", "two"):
+        client.post(
+            "/api/v1/tasks",
+            json={"title": title, "description": "counted", "status": "new"},
+            headers=user["headers"],
+        )
+    assert total("/api/v1/tasks", user["headers"]) == _exact_count("tasks")
+
+    doomed = make_user()
+    before = total("/api/v1/users")
+    client.delete(f"/api/v1/users/{doomed['id']}", headers=doomed["headers"])
+    assert total("/api/v1/users") == before - 1 == _exact_count("users")
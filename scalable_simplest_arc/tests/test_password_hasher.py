@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core.services.users.password import PasswordHasher
+
+
+def _fail():
+    raise ValueError("bad hash")
+
+
+def _die_once(marker: str) -> str:
+    # the first call takes its worker down; the retry finds the marker
+    if not Path(marker).exists():
+        Path(marker).touch()
+        os._exit(1)
+    return "ok"
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.anyio
+async def test_failures_are_not_counted_as_completed(hasher):
+    with pytest.raises(ValueError):
+        await hasher._run(_fail)
+
+    assert hasher.stats.failed == 1
+    assert hasher.stats.completed == 0
+    assert hasher.stats.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_dead_worker_replaces_the_pool_and_retries(hasher, tmp_path):
+    hasher.start()
+    broken = hasher._executor
+
+    assert await hasher._run(_die_once, str(tmp_path / "died")) == "ok"
+
+    assert hasher._executor is not broken
+    assert hasher.stats.restarts == 1
+    assert hasher.stats.completed == 1
+    assert hasher.stats.failed == 0
@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.services.cache import RedisBackend, RowCache
+from src.db.models.users import User
+
+
+@pytest.mark.anyio
+async def test_unresponsive_redis_is_a_fast_miss():
+    # accepts the connection and never answers
+    server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    cache = RowCache(RedisBackend(f"redis://127.0.0.1:{port}/0", timeout=0.05))
+    try:
+        started = time.perf_counter()
+        hit, instance = await cache.get(User, 1)
+        elapsed = time.perf_counter() - started
+    finally:
+        await cache.close()
+        server.close()
+
+    assert (hit, instance) == (False, None)
+    assert cache.stats["users"].errors == 1
+    assert elapsed < 1
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from sqlalchemy import inspect
+
+from src.core.services.singleflight import SingleFlight
+from src.db.models.users import User
+
+
+class Gate:
+    """A call that counts its runs and blocks until released."""
+
+    def __init__(self, result=None, error: Exception | None = None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _settle():
+    # lets the tasks created so far reach their first await
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.anyio
+async def test_followers_share_the_leaders_call():
+    flight = SingleFlight()
+    gate = Gate(result=42)
+
+    leader = asyncio.create_task(flight.do("key", gate))
+    await gate.started.wait()
+    followers = [asyncio.create_task(flight.do("key", gate)) for _ in range(3)]
+    await _settle()
+    gate.release.set()
+
+    assert await asyncio.gather(leader, *followers) == [42] * 4
+    assert gate.calls == 1
+    assert flight.snapshot() == {"leaders": 1, "coalesced": 3}
+
+
+@pytest.mark.anyio
+async def test_exception_reaches_every_follower():
+    flight = SingleFlight()
+    gate = Gate(error=ValueError("boom"))
+
+    leader = asyncio.create_task(flight.do("key", gate))
+    await gate.started.wait()
+    follower = asyncio.create_task(flight.do("key", gate))
+    await _settle()
+    gate.release.set()
+
+    results = await asyncio.gather(leader, follower, return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert gate.calls == 1
+    # nothing is left in flight: the next call runs again
+    gate.error = None
+    assert await flight.do("key", gate) is None
+    assert gate.calls == 2
+
+
+@pytest.mark.anyio
+async def test_follower_takes_over_from_a_cancelled_leader():
+    flight = SingleFlight()
+    gate = Gate(result="fresh")
+
+    leader = asyncio.create_task(flight.do("key", gate))
+    await gate.started.wait()
+    follower = asyncio.create_task(flight.do("key", gate))
+    await _settle()
+    leader.cancel()
+    await _settle()
+    gate.release.set()
+
+    assert await follower == "fresh"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert gate.calls == 2
+    assert flight.stats.leaders == 2
+
+
+@pytest.mark.anyio
+async def test_cancelling_a_follower_leaves_the_leader_running():
+    flight = SingleFlight()
+    gate = Gate(result=1)
+
+    leader = asyncio.create_task(flight.do("key", gate))
+    await gate.started.wait()
+    follower = asyncio.create_task(flight.do("key", gate))
+    await _settle()
+    follower.cancel()
+    await _settle()
+    gate.release.set()
+
+    assert await leader == 1
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    assert gate.calls == 1
+
+
+@pytest.mark.anyio
+async def test_followers_get_detached_copies_of_orm_instances():
+    flight = SingleFlight()
+    user = User(id=7, username="shared", first_name="Ada", last_name="L")
+    gate = Gate(result=user)
+
+    leader = asyncio.create_task(flight.do("key", gate))
+    await gate.started.wait()
+    followers = [asyncio.create_task(flight.do("key", gate)) for _ in range(2)]
+    await _settle()
+    gate.release.set()
+    leader_result, *copies = await asyncio.gather(leader, *followers)
+
+    assert leader_result is user
+    assert copies[0] is not user and copies[1] is not user
+    assert copies[0] is not copies[1]
+    for copy in copies:
+        assert inspect(copy).detached
+        assert (copy.id, copy.username) == (7, "shared")
@@ -0,0 +1,55 @@
+def test_delete_user_who_owns_tasks_is_a_conflict(client, user):
+    response = client.post(
+        "/api/v1/tasks",
+        json={
+            "title": "owned",
+            "description": "keeps its creator",
+            "status": "new",
+            "assignee_id": None,
+        },
+        headers=user["headers"],
+    )
+    assert response.status_code == 201
+
+    response = client.delete(f"/api/v1/users/{user['id']}", headers=user["headers"])
+
+    assert response.status_code == 409
+    assert client.get(f"/api/v1/users/{user['id']}").status_code == 200
+
+
+def test_delete_user_without_tasks(client, user):
+    response = client.delete(f"/api/v1/users/{user['id']}", headers=user["headers"])
+
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/users/{user['id']}").status_code == 404
+
+
+def test_delete_user_needs_a_token(client, user):
+    response = client.delete(f"/api/v1/users/{user['id']}")
+
+    assert response.status_code == 401
+    assert client.get(f"/api/v1/users/{user['id']}").status_code == 200
+
+
+def test_other_user_cannot_update_or_delete(client, user, make_user):
+    other = make_user()
+
+    response = client.put(
+        f"/api/v1/users/{user['id']}",
+        json={
+            "username": user["username"],
+            "first_name": "Mallory",
+            "last_name": "User",
+        },
+        headers=other["headers"],
+    )
+    assert response.status_code == 403
+    response = client.delete(f"/api/v1/users/{user['id']}", headers=other["headers"])
+    assert response.status_code == 403
+    assert client.get(f"/api/v1/users/{user['id']}").status_code == 200
+
+
+def test_admin_can_delete_another_user(client, user, admin):
+    response = client.delete(f"/api/v1/users/{user['id']}", headers=admin["headers"])
+
+    assert response.status_code == 204